@@ -1,34 +1,83 @@
+from collections import Counter
 from functools import cmp_to_key
 from utils.data_store import get_words_tree
-from utils.word_games.words_tree_node import WordsTreeNode
-from typing import List, Set
+from utils.word_games.dawg import Dawg, ROOT, NO_NODE, letter_code
+from utils.word_games.word_index import letters_mask
+from typing import Dict, List, Set, Tuple
 
+MIN_WORD_LENGTH = 3
 
-def find_words(
-    remaining_letters: List[str],
-    current_str: str,
-    current_node: WordsTreeNode
-) -> Set[str]:	
+
+def find_suffixes(
+	letter_counts: Tuple[int, ...],
+	available_mask: int,
+	prefix_length: int,
+	current_node: int,
+	letters: List[str],
+	codes: List[int],
+	tree: Dawg,
+	memo: Dict[Tuple[int, Tuple[int, ...]], List[str]]
+) -> List[str]:
+	"""
+	Finds all the ways to finish a word from the current node with the remaining letters.
+	Each distinct letter is tried once per level, and results are memoized on (node, remaining letters),
+	so repeated letters and prefixes that reach the same node are only explored once.
+
+	Parameters:
+		letter_counts (Tuple[int, ...]): How many of each distinct letter are left, aligned with `letters`.
+		available_mask (int): The letter mask of the letters that are left.
+		prefix_length (int): The length of the prefix that led to the current node.
+		current_node (int): The current node in the word graph.
+		letters (List[str]): The distinct letters that were given.
+		codes (List[int]): The letter code of each of `letters`.
+		tree (Dawg): The word graph.
+		memo (Dict[Tuple[int, Tuple[int, ...]], List[str]]): Suffixes already found, keyed by (node, letter counts).
+	"""
+	# the prefix length follows from the counts, so it does not need to be part of the key
+	key = (current_node, letter_counts)
+	cached = memo.get(key)
+	if cached is not None:
+		return cached
+	suffixes = []
+	if tree.is_end_of_word(current_node) and prefix_length >= MIN_WORD_LENGTH:
+		suffixes.append("")
+	remaining = sum(letter_counts)
+	for index, count in enumerate(letter_counts):
+		if count == 0:
+			continue
+		code = codes[index]
+		next_node = tree.child(current_node, code)
+		if next_node == NO_NODE:
+			continue
+		# a child that does not end a word needs at least one more letter, so skip it if none of its letters are left
+		next_available_mask = available_mask if count > 1 else available_mask & ~(1 << code)
+		if not tree.suffix_letter_masks[next_node] & next_available_mask and not tree.end_of_word[next_node]:
+			continue
+		if tree.min_suffix_length[next_node] >= remaining:
+			continue  # every word below needs more letters than are left
+		next_counts = letter_counts[:index] + (count - 1,) + letter_counts[index+1:]
+		letter = letters[index]
+		for suffix in find_suffixes(next_counts, next_available_mask, prefix_length + 1, next_node, letters, codes, tree, memo):
+			suffixes.append(letter + suffix)
+	memo[key] = suffixes
+	return suffixes
+
+
+def find_words(letters: List[str], tree: Dawg) -> Set[str]:
 	"""
 	Finds all the words that can be made with the given letters.
 
 	Parameters:
-		remaining_letters (List[str]): The letters that can still be used to form words.
-		current_str (str): The current string being formed.
-		current_node (WordsTreeNode): The current node in the tree structure.
+		letters (List[str]): The letters that can be used to form words.
+		tree (Dawg): The word graph.
 	"""
-	if current_node is None:
-		return set()
-	found_words = set()
-	if current_node.isEndOfWord() and len(current_str) >= 3:
-		found_words.add(current_str)
-	for index, letter in enumerate(remaining_letters):
-		found_words.update(find_words(
-			remaining_letters=remaining_letters[:index] + remaining_letters[index+1:],
-			current_str=current_str + letter,
-			current_node=current_node.getChild(letter)
-		))
-	return found_words
+	# letters that are not single lowercase letters cannot be part of any word
+	counts = Counter(letter for letter in letters if letter_code(letter) != -1)
+	distinct_letters = sorted(counts)
+	letter_counts = tuple(counts[letter] for letter in distinct_letters)
+	codes = [letter_code(letter) for letter in distinct_letters]
+	available_mask = letters_mask(distinct_letters)
+	return set(find_suffixes(letter_counts, available_mask, 0, ROOT, distinct_letters, codes, tree, {}))
 
 
 def compare_words(a, b):
@@ -41,7 +90,7 @@ def compare_words(a, b):
 	
 
 def run(letters: List[str]):
-	found_words = find_words(letters, "", get_words_tree())
+	found_words = find_words(letters, get_words_tree())
 	word_cmp_key = cmp_to_key(compare_words)
 	valid_words = sorted(list(found_words), key=word_cmp_key)
 	return valid_words
\ No newline at end of file
@@ -0,0 +1,214 @@
+# Bitboard representation of a Connect 4 position, used by the search
+#
+# Each player's pieces are one integer with a bit per cell. Columns are stacked bottom to top with
+# one spare bit above the top row, so that shifting a four-in-a-row check past the top of a column
+# lands in an always empty bit instead of wrapping into the next column.
+#
+#	 6 13 20 27 34 41 48	<-- spare row, always empty
+#	 5 12 19 26 33 40 47
+#	 4 11 18 25 32 39 46
+#	 3 10 17 24 31 38 45
+#	 2  9 16 23 30 37 44
+#	 1  8 15 22 29 36 43
+#	 0  7 14 21 28 35 42	<-- bottom row (row 0)
+
+from typing import List, Tuple
+from ai.game_pigeon.connect4.enums import BoardSpace
+from ai.game_pigeon.connect4.constants import NUM_ROWS, NUM_COLS, WIN_SCORE
+from ai.game_pigeon.connect4.transposition_table import ZOBRIST_KEYS
+
+COLUMN_BITS = NUM_ROWS + 1
+
+# bit shifts that move a cell one step along a line: vertical, horizontal, and the two diagonals
+LINE_SHIFTS = (1, COLUMN_BITS, COLUMN_BITS - 1, COLUMN_BITS + 1)
+
+# columns from the center out, the order moves are searched in when nothing better is known
+MOVE_ORDER = tuple(sorted(range(NUM_COLS), key=lambda col: abs(col - NUM_COLS // 2)))
+
+# index of each player's pieces in Bitboard.pieces
+PLAYER_INDEX = {BoardSpace.RED: 0, BoardSpace.YELLOW: 1}
+
+
+def cell_bit(row: int, col: int) -> int:
+	"""The bit of a cell, with row 0 at the bottom"""
+	return 1 << (col * COLUMN_BITS + row)
+
+
+def _window_cells() -> List[Tuple[Tuple[int, int], ...]]:
+	"""The (row, col) cells of every line of four on the board"""
+	windows = []
+	for row in range(NUM_ROWS):
+		for col in range(NUM_COLS):
+			for row_step, col_step in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+				cells = tuple((row + i * row_step, col + i * col_step) for i in range(4))
+				if all(0 <= r < NUM_ROWS and 0 <= c < NUM_COLS for r, c in cells):
+					windows.append(cells)
+	return windows
+
+
+WINDOW_MASKS = [sum(cell_bit(row, col) for row, col in cells) for cells in _window_cells()]  # 69 lines of four
+CENTER_COLUMN_MASK = sum(cell_bit(row, NUM_COLS // 2) for row in range(NUM_ROWS))
+
+
+def has_four(pieces: int) -> bool:
+	"""
+	Checks whether a player's pieces contain four in a row, with one shift and mask per direction.
+
+	Parameters:
+		pieces (int): The player's pieces.
+
+	Returns:
+		bool: True if there are four in a row in any direction.
+	"""
+	for shift in LINE_SHIFTS:
+		pairs = pieces & (pieces >> shift)
+		if pairs & (pairs >> (2 * shift)):
+			return True
+	return False
+
+
+def _window_score(num_mine: int, num_theirs: int) -> int:
+	"""The heuristic score of a window for a player, from the number of pieces of each player in it"""
+	if num_theirs == 0:
+		return {4: WIN_SCORE, 3: 10, 2: 5}.get(num_mine, 0)
+	if num_mine == 0:
+		return {3: -8, 2: -3}.get(num_theirs, 0)
+	return 0  # a window with pieces of both players can never be won
+
+
+# A Bitboard keeps a code per window of the number of pieces of each player in it:
+# code = PIECE_STEPS[0] * red pieces + PIECE_STEPS[1] * yellow pieces. Adding a piece adds its player's step.
+PIECE_STEPS = (5, 1)
+WINDOW_CODES = range(5 * 5)
+
+# SCORE_GAINS[mover][player][code]: how much a player's score changes when the mover adds a piece to a window with the code
+_code_scores = [
+	[_window_score(code // 5, code % 5) for code in WINDOW_CODES],
+	[_window_score(code % 5, code // 5) for code in WINDOW_CODES],
+]
+SCORE_GAINS = [
+	[
+		[
+			_code_scores[player][code + PIECE_STEPS[mover]] - _code_scores[player][code] if code + PIECE_STEPS[mover] in WINDOW_CODES else 0
+			for code in WINDOW_CODES
+		]
+		for player in range(2)
+	]
+	for mover in range(2)
+]
+
+# the windows each cell is part of, and the bonus for a piece in the center column, by bit index
+CELL_WINDOWS = [
+	tuple(window_id for window_id, window in enumerate(WINDOW_MASKS) if window >> index & 1)
+	for index in range(NUM_COLS * COLUMN_BITS)
+]
+CENTER_BONUS = [2 if CENTER_COLUMN_MASK >> index & 1 else 0 for index in range(NUM_COLS * COLUMN_BITS)]
+
+
+class Bitboard:
+	"""
+	A Connect 4 position: two integers of pieces and the height of each column.
+	Moves are made and unmade in place, so the search never copies a board.
+	The heuristic score of each player is kept up to date as pieces are added and removed, from the piece
+	counts of each window, so scoring a position costs nothing extra.
+
+	Attributes:
+		pieces (List[int]): The pieces of each player, indexed by PLAYER_INDEX.
+		heights (List[int]): The number of pieces in each column.
+		hash (int): The Zobrist hash of the pieces.
+		window_codes (List[int]): The piece counts of each window of WINDOW_MASKS, encoded with PIECE_STEPS.
+		scores (List[int]): The heuristic score of each player, as `score_board` would compute it.
+	"""
+	__slots__ = ('pieces', 'heights', 'hash', 'window_codes', 'scores')
+
+	def __init__(self):
+		self.pieces = [0, 0]
+		self.heights = [0] * NUM_COLS
+		self.hash = 0
+		self.window_codes = [0] * len(WINDOW_MASKS)
+		self.scores = [0, 0]
+
+	@classmethod
+	def from_matrix(cls, board: List[List[BoardSpace]]) -> 'Bitboard':
+		"""
+		Parameters:
+			board (List[List[BoardSpace]]): The board, indexed [row][col] with row 0 at the bottom.
+
+		Returns:
+			Bitboard: The same position.
+		"""
+		position = cls()
+		for row in range(NUM_ROWS):
+			for col in range(NUM_COLS):
+				space = board[row][col]
+				if space != BoardSpace.EMPTY:
+					position.add_piece(col * COLUMN_BITS + row, PLAYER_INDEX[space])
+		for col in range(NUM_COLS):
+			# pieces drop to the lowest empty space, like `perform_move`
+			height = 0
+			while height < NUM_ROWS and board[height][col] != BoardSpace.EMPTY:
+				height += 1
+			position.heights[col] = height
+		return position
+
+	def valid_moves(self) -> List[int]:
+		"""The columns that are not full, center first"""
+		return [col for col in MOVE_ORDER if self.heights[col] < NUM_ROWS]
+
+	def play(self, col: int, player: int) -> None:
+		"""Drops a piece of the player (a PLAYER_INDEX value) into a column that is not full"""
+		self.add_piece(col * COLUMN_BITS + self.heights[col], player)
+		self.heights[col] += 1
+
+	def undo(self, col: int, player: int) -> None:
+		"""Takes back the last piece the player dropped into a column"""
+		self.heights[col] -= 1
+		self.remove_piece(col * COLUMN_BITS + self.heights[col], player)
+
+	def add_piece(self, index: int, player: int) -> None:
+		"""Puts a piece of the player on an empty cell, by bit index, without changing the column heights"""
+		self.pieces[player] |= 1 << index
+		self.hash ^= ZOBRIST_KEYS[player][index]
+		codes = self.window_codes
+		step = PIECE_STEPS[player]
+		red_gains, yellow_gains = SCORE_GAINS[player]
+		red_score, yellow_score = self.scores
+		for window_id in CELL_WINDOWS[index]:
+			code = codes[window_id]
+			red_score += red_gains[code]
+			yellow_score += yellow_gains[code]
+			codes[window_id] = code + step
+		self.scores[0] = red_score
+		self.scores[1] = yellow_score
+		self.scores[player] += CENTER_BONUS[index]
+
+	def remove_piece(self, index: int, player: int) -> None:
+		"""Takes a piece of the player off a cell, by bit index, undoing `add_piece`"""
+		self.pieces[player] ^= 1 << index
+		self.hash ^= ZOBRIST_KEYS[player][index]
+		codes = self.window_codes
+		step = PIECE_STEPS[player]
+		red_gains, yellow_gains = SCORE_GAINS[player]
+		red_score, yellow_score = self.scores
+		for window_id in CELL_WINDOWS[index]:
+			code = codes[window_id] - step
+			red_score -= red_gains[code]
+			yellow_score -= yellow_gains[code]
+			codes[window_id] = code
+		self.scores[0] = red_score
+		self.scores[1] = yellow_score
+		self.scores[player] -= CENTER_BONUS[index]
+
+
+def score_position(position: Bitboard, player: int) -> int:
+	"""
+	Scores a position for a player with the same heuristic as `score_board`, in constant time.
+
+	Parameters:
+		position (Bitboard): The position.
+		player (int): The PLAYER_INDEX of the player to score for.
+
+	Returns:
+		int: The score of the position for the player.
+	"""
+	return position.scores[player]
@@ -1,16 +1,58 @@
 # Kyle Gerner 
 # Started 3.18.21
 # Connect 4 Solver, client facing
-from typing import List, Tuple
-from ai.game_pigeon.connect4.connect4_strategy import Connect4Strategy, perform_move, check_if_game_over, find_winner
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, List, Optional, Tuple
+from ai.game_pigeon.connect4.connect4_strategy import Connect4Strategy, DEFAULT_TABLE_SIZE, initialize_search_worker, perform_move, check_if_game_over, find_winner
+from ai.game_pigeon.connect4.opening_book import get_opening_book
+from ai.game_pigeon.connect4.transposition_table import TranspositionTable
 from ai.game_pigeon.connect4.enums import BoardSpace
-from ai.game_pigeon.connect4.constants import NUM_ROWS, NUM_COLS, DEFAULT_MAX_DEPTH
+from ai.game_pigeon.connect4.constants import NUM_ROWS, NUM_COLS, DEFAULT_MAX_DEPTH, MAX_SEARCH_DEPTH, MAX_UNTIMED_DEPTH, MAX_TIME_BUDGET_MS
 from utils.error import BackendError
+from utils.lru_cache import CacheStats
+from utils.worker_pool import POOL_CONTEXT, WorkerPool
 
 
 AI_PIECE = BoardSpace.RED  # AI will always be RED
 USER_PIECE = BoardSpace.YELLOW  # User will always be YELLOW
 
+# Transposition table slots per search (rounded down to a power of two). With CONNECT4_SHARE_TABLE=1 every
+# request in this worker uses one table, so positions searched for earlier moves of a game are not searched again.
+TABLE_SIZE = int(os.getenv('CONNECT4_TABLE_SIZE', str(DEFAULT_TABLE_SIZE)))
+SHARE_TABLE = os.getenv('CONNECT4_SHARE_TABLE', '0') == '1'
+
+_shared_table = TranspositionTable(TABLE_SIZE) if SHARE_TABLE else None
+_last_table = _shared_table if _shared_table is not None else TranspositionTable(TABLE_SIZE)
+
+# Worker processes for parallel searches, and the shared best root score they prune against. Sized by
+# WORKER_POOL_SIZE, like the word game pool, and started by the server at startup.
+_shared_best = POOL_CONTEXT.Array('q', 1)
+_search_pool = WorkerPool("Connect 4 search", initialize_search_worker, (_shared_best,))
+
+
+def start_search_pool() -> None:
+    """
+    Starts the Connect 4 search workers and waits until they are up, see `WorkerPool.start`.
+    """
+    _search_pool.start()
+
+
+def get_search_pool() -> Optional[Tuple[ProcessPoolExecutor, Any]]:
+    """
+    Returns:
+        Tuple[ProcessPoolExecutor, Any] | None: The pool and its shared best score, or None if the pool is not
+            running, in which case searches run in process.
+    """
+    executor = _search_pool.get()
+    return None if executor is None else (executor, _shared_best)
+
+
+def shutdown_search_pool() -> None:
+    """Stops the Connect 4 search workers, if they were started."""
+    _search_pool.shutdown()
+
 
 def _build_board_matrix(
         player_locations: List[Tuple[int, int]], 
@@ -49,8 +91,11 @@ def _debug_board(board: List[List[BoardSpace]]) -> None:
 def run(
         player_locations: List[Tuple[int, int]], 
         ai_locations: List[Tuple[int, int]], 
-        max_search_depth: int = DEFAULT_MAX_DEPTH
-    ) -> Tuple[int, bool]:
+        max_search_depth: int = DEFAULT_MAX_DEPTH,
+        tie_break_seed: Optional[int] = None,
+        time_budget_ms: Optional[int] = None,
+        parallel: bool = False
+    ) -> Tuple[int, bool, int, int]:
     """
     Main method to run the Connect 4 game client.
 
@@ -58,19 +103,53 @@ def run(
         player_locations (List[Tuple[int, int]]): The locations of the player's pieces.
         ai_locations (List[Tuple[int, int]]): The locations of the AI's pieces.
         max_search_depth (int): The maximum search depth for the AI strategy.
+        tie_break_seed (Optional[int]): Seeds a random choice between equally good moves. By default the
+            same position always gets the same move. With a seed the opening book is not used.
+        time_budget_ms (Optional[int]): Stop deepening the search after this many milliseconds, returning the best
+            move of the deepest completed search. Required for depths over MAX_UNTIMED_DEPTH.
+        parallel (bool): Split each depth's root moves across the search workers. Picks the same move as the
+            serial search. Until the workers are up the search runs in process.
 
     Returns:
-        Tuple[int, bool]: The column chosen by the AI and whether it resulted in a win.
+        Tuple[int, bool, int, int]: The column chosen by the AI, whether it resulted in a win, the search depth
+            reached and the number of positions searched.
+    Raises:
+        BackendError: If the search depth or time budget is out of range, or the board has no valid moves.
     """
+    global _last_table
+    if not 1 <= max_search_depth <= MAX_SEARCH_DEPTH:
+        raise BackendError(ValueError(f"Search depth must be between 1 and {MAX_SEARCH_DEPTH}."))
+    if time_budget_ms is None and max_search_depth > MAX_UNTIMED_DEPTH:
+        raise BackendError(ValueError(f"Searches deeper than {MAX_UNTIMED_DEPTH} need a time budget."))
+    if time_budget_ms is not None and not 1 <= time_budget_ms <= MAX_TIME_BUDGET_MS:
+        raise BackendError(ValueError(f"Time budget must be between 1 and {MAX_TIME_BUDGET_MS} ms."))
     board = _build_board_matrix(player_locations, ai_locations)
-    ai = Connect4Strategy(AI_PIECE)
-    best_move = ai.get_move(board, max_search_depth)
+    table = _shared_table if _shared_table is not None else TranspositionTable(TABLE_SIZE)
+    _last_table = table
+    search_pool = get_search_pool() if parallel else None
+    ai = Connect4Strategy(AI_PIECE, table, tie_break_seed, get_opening_book(), search_pool)
+    try:
+        best_move = ai.get_move(board, max_search_depth, time_budget_ms)
+    except BrokenProcessPool:
+        # a worker died, so restart the pool and search in process this time
+        _search_pool.discard(search_pool[0])
+        ai = Connect4Strategy(AI_PIECE, table, tie_break_seed, get_opening_book())
+        best_move = ai.get_move(board, max_search_depth, time_budget_ms)
     if best_move is None:
         raise BackendError(ValueError(f"Board has no valid moves."))
     
     perform_move(board, best_move, AI_PIECE)
     is_win, _ = check_if_game_over(board)
-    return best_move, is_win
+    return best_move, is_win, ai.depth_reached, ai.nodes_searched
+
+
+def get_table_stats() -> CacheStats:
+    """
+    Returns:
+        CacheStats: The counters of the shared transposition table, or of the last search's table if tables
+            are not shared.
+    """
+    return _last_table.stats()
 
 
 def check_game_over(
@@ -2,46 +2,263 @@
 # Kyle Gerner 3.18.21
 # Contains AI strategy and board manipulation methods
 
-from typing import List, Union, Tuple
+from concurrent.futures import Executor
+from typing import Any, List, Optional, Union, Tuple
 from typing_extensions import Annotated
+import itertools
 import math  # for infinities
-import random  # for randomizing valid moves list in minimax
+import random  # for the seeded tie-break between equally good moves
+import time
 from ai.game_pigeon.connect4.connect4_player import Connect4Player  # super class
 from ai.game_pigeon.connect4.enums import BoardSpace, PlayerBoardSpace
-from ai.game_pigeon.connect4.constants import NUM_ROWS, NUM_COLS
+from ai.game_pigeon.connect4.constants import NUM_ROWS, NUM_COLS, WIN_SCORE
+from ai.game_pigeon.connect4.bitboard import Bitboard, COLUMN_BITS, MOVE_ORDER, PLAYER_INDEX, has_four, score_position
+from ai.game_pigeon.connect4.opening_book import OpeningBook
+from ai.game_pigeon.connect4.transposition_table import TranspositionTable, MAXIMIZING_KEY, EXACT, LOWER_BOUND, UPPER_BOUND
 
+DEFAULT_TABLE_SIZE = 1 << 16  # transposition table slots
+ASPIRATION_WINDOW = 50  # half width of the root search window around the previous iteration's score
+NUM_KILLERS = 2  # killer moves remembered per depth
+DEADLINE_CHECK_INTERVAL = 1024  # nodes searched between checks of the time budget
 
-WIN_SCORE = 1000000  # large enough to always be the preferred outcome
+
+class SearchTimeout(Exception):
+	"""Raised inside the search when its time budget runs out"""
 
 
 class Connect4Strategy(Connect4Player):
 
-	def __init__(self, color: PlayerBoardSpace):
+	def __init__(
+			self,
+			color: PlayerBoardSpace,
+			table: Optional[TranspositionTable] = None,
+			tie_break_seed: Optional[int] = None,
+			book: Optional[OpeningBook] = None,
+			search_pool: Optional[Tuple[Executor, Any]] = None
+		):
+		"""
+		Parameters:
+			color (PlayerBoardSpace): The AI's color.
+			table (Optional[TranspositionTable]): A table to keep search results in, so they can be reused by
+				later searches. By default each strategy gets its own table.
+			tie_break_seed (Optional[int]): Seeds a random choice between root moves with the best score.
+				By default the tied move closest to the center is played, so the same position always gets the same move.
+			book (Optional[OpeningBook]): Precomputed moves for opening positions, see `opening_book` and `get_move`.
+			search_pool (Optional[Tuple[Executor, Any]]): Worker processes to split root moves across, started with
+				`initialize_search_worker`, and the shared int64 array they were given. By default the search is serial.
+		"""
 		super().__init__(color)
 		self.AI_COLOR = color
 		self.HUMAN_COLOR = opponent_of(color)
-
-	def get_move(self, board: List[List[str]], max_depth: int) -> Union[int, None]:
+		self.AI_INDEX = PLAYER_INDEX[color]
+		self.HUMAN_INDEX = PLAYER_INDEX[self.HUMAN_COLOR]
+		self.table = table if table is not None else TranspositionTable(DEFAULT_TABLE_SIZE)
+		self.tie_break = random.Random(tie_break_seed) if tie_break_seed is not None else None
+		self.book = book
+		self.search_pool = search_pool
+		self.search_id = 0  # identifies the current `search` to the search workers
+		# in a search worker, the best root score found by any worker so far (see `search_root_parallel`)
+		self.shared_best: Optional[Any] = None
+		self.nodes_searched = 0
+		self.depth_reached = 0
+		self.deadline: Optional[float] = None  # time.perf_counter() value at which the search stops, if any
+		# move ordering heuristics, reset for every search
+		self.killers: List[List[int]] = []
+		self.history: List[List[int]] = []
+
+	def get_move(self, board: List[List[str]], max_depth: int, time_budget_ms: Optional[float] = None) -> Union[int, None]:
 		"""
-		Calculates the best move for the AI based on the current board state.
+		Calculates the best move for the AI based on the current board state. Positions in the opening book are
+		answered from it if `max_depth` is at least the book's search depth, so a shallower search, which plays
+		a weaker game on purpose, is never given a deeper move. With a tie-break seed the book is not used,
+		since it holds a single move per position. A book answer has `depth_reached` set to the book's search
+		depth and `nodes_searched` set to 0. Otherwise see `search`.
 
 		Parameters:
 			board (List[List[str]]): The current game board
 			max_depth (int): The maximum depth to search for the AI strategy
+			time_budget_ms (Optional[float]): How long to search for, in milliseconds, or None to always reach `max_depth`
+		Returns:
+			int | None: The column index for the AI's move, or None if no valid moves
+		"""
+		position = Bitboard.from_matrix(board)
+		if self.book is not None and self.tie_break is None and max_depth >= self.book.search_depth:
+			book_move = self.book.lookup(position.pieces[self.AI_INDEX], position.pieces[self.HUMAN_INDEX])
+			if book_move is not None and position.heights[book_move] < NUM_ROWS:
+				self.nodes_searched = 0
+				self.depth_reached = self.book.search_depth
+				return book_move
+		return self.search(position, max_depth, time_budget_ms)
+
+	def search(self, position: Bitboard, max_depth: int, time_budget_ms: Optional[float] = None) -> Union[int, None]:
+		"""
+		Searches for the best move for the AI with iterative deepening.
+		Each deepening iteration searches the previous iteration's best move first, inside an aspiration
+		window around its score, and searches again with a full window if the score falls outside it.
+		With a time budget, deepening stops once the budget is used up, and the best move of the last
+		completed iteration is returned. The first iteration always completes, so there is always a move.
+		The depth reached and the number of nodes searched are kept in `depth_reached` and `nodes_searched`.
+
+		Parameters:
+			position (Bitboard): The current game position, with the AI to move. It is unchanged when this returns.
+			max_depth (int): The maximum depth to search
+			time_budget_ms (Optional[float]): How long to search for, in milliseconds, or None to always reach `max_depth`
 		Returns:
 			int | None: The column index for the AI's move, or None if no valid moves
 		"""
-		move, score = -123, -123  # placeholders
+		start = time.perf_counter()
+		self.nodes_searched = 0
+		self.depth_reached = 0
+		self.deadline = None
+		# searching deeper than the number of empty cells would only repeat the same search
+		max_depth = min(max_depth, sum(NUM_ROWS - height for height in position.heights))
+		self.reset_heuristics(max_depth)
+		# results are kept across the deepening iterations below, but may be replaced once this search is done
+		self.table.new_search()
+		self.search_id = next(_search_ids)
+		if has_four(position.pieces[self.AI_INDEX]):
+			return None  # the game is already over
+		move, score = None, None
 		for i in range(1, max_depth + 1):  # iterative deepening
+			try:
+				if score is None or abs(score) >= WIN_SCORE:
+					best_moves, score = self.search_root(position, i, -math.inf, math.inf, move)
+				else:
+					alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+					best_moves, score = self.search_root(position, i, alpha, beta, move)
+					if score <= alpha or score >= beta:
+						best_moves, score = self.search_root(position, i, -math.inf, math.inf, move)
+			except SearchTimeout:
+				break  # keep the move of the last completed iteration
+			if not best_moves:
+				return None
+			move = self.choose_move(best_moves)
+			self.depth_reached = i
 			# this will prioritize game winning move sequences that finish in less moves
-			move, score = self.minimax(board, 0, True, -math.inf, math.inf, i)
 			if score == WIN_SCORE:
 				break
+			if time_budget_ms is not None:
+				self.deadline = start + time_budget_ms / 1000
+				if time.perf_counter() >= self.deadline:
+					break
 		return move
 
+	def choose_move(self, best_moves: List[int]) -> int:
+		"""Picks one of the root moves that tie for the best score, closest to the center unless seeded"""
+		best_moves = sorted(best_moves, key=MOVE_ORDER.index)
+		if self.tie_break is None:
+			return best_moves[0]
+		return self.tie_break.choice(best_moves)
+
+	def search_root(
+			self,
+			position: Bitboard,
+			local_max_depth: int,
+			alpha: int,
+			beta: int,
+			principal_move: Optional[int]
+		) -> Tuple[List[int], int]:
+		"""
+		Searches every root move, keeping every move that ties for the best score. Each move after the first
+		is searched with alpha just below the best score so far, so a move that ties it gets its exact score.
+
+		Parameters:
+			position (Bitboard): The current game position, with the AI to move
+			local_max_depth (int): The maximum depth to search
+			alpha (int): The lower end of the root search window
+			beta (int): The upper end of the root search window
+			principal_move (Optional[int]): The best move of the previous iteration, searched first
+		Returns:
+			tuple[list[int], int]: The moves with the best score (empty if the game is over), and that score.
+				If the score is outside (alpha, beta) it is only a bound.
+		"""
+		self.nodes_searched += 1
+		if has_four(position.pieces[self.HUMAN_INDEX]):
+			return [], -1 * WIN_SCORE
+		valid_moves = position.valid_moves()
+		if not valid_moves:
+			return [], 0  # no winner
+		if principal_move in valid_moves:
+			valid_moves.remove(principal_move)
+			valid_moves.insert(0, principal_move)
+		if self.search_pool is not None:
+			return self.search_root_parallel(position, local_max_depth, alpha, beta, valid_moves)
+		score = -math.inf
+		best_moves = []
+		for move in valid_moves:
+			position.play(move, self.AI_INDEX)
+			_, updated_score = self.minimax(position, 1, False, max(alpha, score - 1), beta, local_max_depth)
+			position.undo(move, self.AI_INDEX)
+			if updated_score > score:
+				score = updated_score
+				best_moves = [move]
+			elif updated_score == score:
+				best_moves.append(move)
+			if score >= beta:
+				break  # fails high, the caller searches again
+		return best_moves, score
+
+	def search_root_parallel(
+			self,
+			position: Bitboard,
+			local_max_depth: int,
+			alpha: int,
+			beta: int,
+			valid_moves: List[int]
+		) -> Tuple[List[int], int]:
+		"""
+		Searches the root moves across the search pool, with the same result as the serial loop in `search_root`.
+		The first move is searched here, to get a score the other moves have to beat, then the others are
+		searched by the workers at once. The best score so far is kept in shared memory: each worker publishes
+		its score when it finishes, and the others raise their alpha to it as they go, so they prune as much
+		as they would have searching one after another.
+
+		Parameters:
+			position (Bitboard): The current game position, with the AI to move and no winner yet
+			local_max_depth (int): The maximum depth to search
+			alpha (int): The lower end of the root search window
+			beta (int): The upper end of the root search window
+			valid_moves (List[int]): The root moves, in the order to search them
+		Returns:
+			tuple[list[int], int]: The moves with the best score, and that score, see `search_root`.
+		"""
+		first_move, other_moves = valid_moves[0], valid_moves[1:]
+		position.play(first_move, self.AI_INDEX)
+		_, score = self.minimax(position, 1, False, alpha, beta, local_max_depth)
+		position.undo(first_move, self.AI_INDEX)
+		best_moves = [first_move]
+		if score >= beta or not other_moves:
+			return best_moves, score
+
+		executor, shared_best = self.search_pool
+		shared_best[0] = score
+		time_left_ms = None
+		if self.deadline is not None:
+			time_left_ms = (self.deadline - time.perf_counter()) * 1000
+			if time_left_ms <= 0:
+				raise SearchTimeout()
+		futures = [
+			executor.submit(search_root_move, self.search_id, position, self.AI_COLOR, move, local_max_depth, max(alpha, score - 1), beta, time_left_ms)
+			for move in other_moves
+		]
+		timed_out = False
+		for move, future in zip(other_moves, futures):
+			updated_score, nodes = future.result()
+			self.nodes_searched += nodes
+			if updated_score is None:
+				timed_out = True
+			elif updated_score > score:
+				score = updated_score
+				best_moves = [move]
+			elif updated_score == score:
+				best_moves.append(move)
+		if timed_out:
+			raise SearchTimeout()
+		return best_moves, score
+
 	def minimax(
 			self, 
-			board: List[List[str]], 
+			position: Bitboard, 
 			depth: int, 
 			is_max: bool, 
 			alpha: int, 
@@ -49,10 +266,14 @@ class Connect4Strategy(Connect4Player):
 			local_max_depth: int
 		) -> Tuple[Union[int, None], int]:
 		"""
-		Recursively finds the best move for a given board
+		Recursively finds the best move for a given position. Moves are made and unmade on the position
+		in place, so it is unchanged when this returns. Results are stored in the transposition table,
+		and a stored result that was searched at least as deeply is used instead of searching again.
+		Moves are tried in a fixed order: the stored best move, the killer moves of this depth, then by
+		history score, then center first.
 
 		Parameters:
-			board (List[List[str]]): The current game board
+			position (Bitboard): The current game position
 			depth (int): The current depth in the recursion
 			is_max (bool): True if maximizing player's turn, False if minimizing player's turn
 			alpha (int): The best score that the maximizing player can guarantee at this level or above
@@ -62,54 +283,219 @@ class Connect4Strategy(Connect4Player):
 			tuple[int | None, int]: A tuple where the first element is the best move (or None if no valid moves),
 									  and the second element is the score of that move
 		"""
-		valid_moves = get_valid_moves(board)
-		random.shuffle(valid_moves)
-		game_over, winner = check_if_game_over(board)
-		if game_over:
-			if winner == self.AI_COLOR:
-				return None, WIN_SCORE
-			elif winner == self.HUMAN_COLOR:
-				return None, -1 * WIN_SCORE
-			else:
-				# no winner
-				return None, 0
+		self.nodes_searched += 1
+		if self.deadline is not None and not self.nodes_searched % DEADLINE_CHECK_INTERVAL and time.perf_counter() >= self.deadline:
+			raise SearchTimeout()
+		# only the player who just moved can have won
+		if is_max and has_four(position.pieces[self.HUMAN_INDEX]):
+			return None, -1 * WIN_SCORE
+		if not is_max and has_four(position.pieces[self.AI_INDEX]):
+			return None, WIN_SCORE
+		valid_moves = position.valid_moves()
+		if not valid_moves:
+			return None, 0  # no winner
 		if depth == local_max_depth:
-			return None, score_board(board, self.AI_COLOR)
+			return None, score_position(position, self.AI_INDEX)
+
+		key = position.hash ^ MAXIMIZING_KEY if is_max else position.hash
+		remaining_depth = local_max_depth - depth
+		stored_move = None
+		entry = self.table.probe(key)
+		if entry is not None:
+			_, stored_depth, bound, stored_score, stored_move, _ = entry
+			if stored_depth >= remaining_depth:
+				if bound == EXACT:
+					return stored_move, stored_score
+				if bound == LOWER_BOUND:
+					alpha = max(alpha, stored_score)
+				else:
+					beta = min(beta, stored_score)
+				if alpha >= beta:
+					return stored_move, stored_score
+		original_alpha, original_beta = alpha, beta
+		player = self.AI_INDEX if is_max else self.HUMAN_INDEX
+		valid_moves = self.order_moves(position, valid_moves, depth, player, stored_move)
+
 		if is_max:
 			# want to maximize this move
 			score = -math.inf
 			best_move = valid_moves[0]  # default best move
 			for move in valid_moves:
-				board_copy = copy_of_board(board)
-				perform_move(board_copy, move, self.AI_COLOR)
-				_, updated_score = self.minimax(board_copy, depth + 1, False, alpha, beta, local_max_depth)
+				position.play(move, self.AI_INDEX)
+				_, updated_score = self.minimax(position, depth + 1, False, alpha, beta, local_max_depth)
+				position.undo(move, self.AI_INDEX)
 				if updated_score > score:
 					score = updated_score
 					best_move = move
 				alpha = max(alpha, score)
 				if alpha >= beta:
+					self.record_cutoff(position, move, depth, player, remaining_depth)
 					break  # pruning
+			self.store(key, remaining_depth, score, best_move, original_alpha, original_beta)
 			return best_move, score
 		else:
 			# want to minimize this move
 			score = math.inf
 			best_move_for_human = valid_moves[0]
 			for move in valid_moves:
-				board_copy = copy_of_board(board)
-				perform_move(board_copy, move, self.HUMAN_COLOR)
-				_, updated_score = self.minimax(board_copy, depth + 1, True, alpha, beta, local_max_depth)
+				if depth == 1 and self.shared_best is not None and self.shared_best[0] - 1 > alpha:
+					# another worker found a better root move, so this one only has to be shown worse than it
+					alpha = original_alpha = self.shared_best[0] - 1
+				position.play(move, self.HUMAN_INDEX)
+				_, updated_score = self.minimax(position, depth + 1, True, alpha, beta, local_max_depth)
+				position.undo(move, self.HUMAN_INDEX)
 				if updated_score < score:
 					score = updated_score
 					best_move_for_human = move
 				beta = min(beta, score)
 				if beta <= alpha:
+					self.record_cutoff(position, move, depth, player, remaining_depth)
 					break  # pruning
+			self.store(key, remaining_depth, score, best_move_for_human, original_alpha, original_beta)
 			return best_move_for_human, score
 
+	def reset_heuristics(self, max_depth: int) -> None:
+		"""Forgets the killer moves and history scores, before a new search up to `max_depth`"""
+		self.killers = [[] for _ in range(max_depth + 1)]
+		self.history = [[0] * (NUM_COLS * COLUMN_BITS) for _ in range(2)]
+
+	def order_moves(
+			self,
+			position: Bitboard,
+			valid_moves: List[int],
+			depth: int,
+			player: int,
+			stored_move: Optional[int]
+		) -> List[int]:
+		"""
+		Orders moves by how likely they are to cause a cutoff: the transposition table's best move, then the
+		killer moves of this depth, then by history score. Ties keep the center first order of `valid_moves`.
+
+		Parameters:
+			position (Bitboard): The current game position
+			valid_moves (List[int]): The valid moves, center first
+			depth (int): The current depth in the recursion
+			player (int): The PLAYER_INDEX of the player to move
+			stored_move (Optional[int]): The best move stored in the transposition table, if any
+		Returns:
+			list[int]: The moves in the order to search them
+		"""
+		history = self.history[player]
+		heights = position.heights
+		moves = sorted(valid_moves, key=lambda col: -history[col * COLUMN_BITS + heights[col]])
+		for killer in reversed(self.killers[depth]):
+			if killer in moves:
+				moves.remove(killer)
+				moves.insert(0, killer)
+		if stored_move is not None and stored_move in moves:
+			moves.remove(stored_move)
+			moves.insert(0, stored_move)
+		return moves
+
+	def record_cutoff(self, position: Bitboard, move: int, depth: int, player: int, remaining_depth: int) -> None:
+		"""
+		Remembers a move that caused a cutoff: as a killer move at this depth, and in the history table for
+		the cell it fills, weighted by how much search the cutoff saved.
+		"""
+		killers = self.killers[depth]
+		if move not in killers:
+			killers.insert(0, move)
+			del killers[NUM_KILLERS:]
+		self.history[player][move * COLUMN_BITS + position.heights[move]] += remaining_depth * remaining_depth
+
+	def store(self, key: int, depth: int, score: int, best_move: int, alpha: int, beta: int) -> None:
+		"""
+		Stores a search result in the transposition table, with the bound type implied by the search window.
+
+		Parameters:
+			key (int): The position's key.
+			depth (int): The number of moves searched below the position.
+			score (int): The score found.
+			best_move (int): The best move found.
+			alpha (int): The alpha the position was searched with.
+			beta (int): The beta the position was searched with.
+		"""
+		if score <= alpha:
+			bound = UPPER_BOUND  # every move failed low, so the score is only an upper bound
+		elif score >= beta:
+			bound = LOWER_BOUND  # a move failed high, so the remaining moves were not searched
+		else:
+			bound = EXACT
+		self.table.store(key, depth, bound, score, best_move)
+
+
+# numbers each search, so search workers know when a new one starts
+_search_ids = itertools.count(1)
+
+# search worker state, see `initialize_search_worker`
+_worker_shared_best: Optional[Any] = None
+_worker_table: Optional[TranspositionTable] = None
+_worker_search_id: Optional[int] = None
+
+
+def initialize_search_worker(shared_best: Any) -> None:
+	"""
+	Prepares a worker process for `search_root_move`.
+
+	Parameters:
+		shared_best (Any): A shared int64 array, whose first value holds the best root score found so far.
+	"""
+	global _worker_shared_best, _worker_table
+	_worker_shared_best = shared_best
+	# kept for the life of the worker, so each search reuses what earlier ones found
+	_worker_table = TranspositionTable(DEFAULT_TABLE_SIZE)
+
+
+def search_root_move(
+		search_id: int,
+		position: Bitboard,
+		ai_color: PlayerBoardSpace,
+		move: int,
+		local_max_depth: int,
+		alpha: int,
+		beta: int,
+		time_left_ms: Optional[float]
+	) -> Tuple[Optional[int], int]:
+	"""
+	Searches one root move in a search worker, and publishes its score to the other workers.
+
+	Parameters:
+		search_id (int): The `Connect4Strategy.search_id` of the search this move is part of
+		position (Bitboard): The root position, with the AI to move
+		ai_color (PlayerBoardSpace): The AI's color
+		move (int): The root move to search
+		local_max_depth (int): The maximum depth to search
+		alpha (int): The lower end of the search window
+		beta (int): The upper end of the search window
+		time_left_ms (Optional[float]): How long the search may take, if it has a time budget
+	Returns:
+		tuple[int | None, int]: The move's score (None if the time ran out), and the number of nodes searched.
+	"""
+	global _worker_search_id
+	if search_id != _worker_search_id:
+		# like `search` does, so entries from earlier searches may be replaced by this one's
+		_worker_table.new_search()
+		_worker_search_id = search_id
+	strategy = Connect4Strategy(ai_color, _worker_table)
+	strategy.shared_best = _worker_shared_best
+	strategy.reset_heuristics(local_max_depth)
+	if time_left_ms is not None:
+		strategy.deadline = time.perf_counter() + time_left_ms / 1000
+	position.play(move, strategy.AI_INDEX)
+	try:
+		_, score = strategy.minimax(position, 1, False, alpha, beta, local_max_depth)
+	except SearchTimeout:
+		return None, strategy.nodes_searched
+	with _worker_shared_best.get_lock():
+		if score > _worker_shared_best[0]:
+			_worker_shared_best[0] = score
+	return score, strategy.nodes_searched
+
 
 def score_board(board: List[List[str]], color: PlayerBoardSpace) -> int:
 	"""
-	Scores the entire board for a given color
+	Scores the entire board for a given color. The search scores bitboard positions with `score_position`,
+	which gives the same scores.
 
 	Parameters:
 		board (List[List[str]]): The game board
@@ -275,8 +661,3 @@ def perform_move(board: List[List[str]], col: int, color: PlayerBoardSpace) -> N
 			break
 		row_of_placement += 1
 	board[row_of_placement][col] = color
-
-
-def copy_of_board(board: List[List[str]]) -> List[List[str]]:
-	"""Creates a copy of the given board"""
-	return list(map(list, board))
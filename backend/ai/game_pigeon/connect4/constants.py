@@ -2,3 +2,8 @@ NUM_ROWS = 6
 NUM_COLS = 7
 
 DEFAULT_MAX_DEPTH = 6
+MAX_SEARCH_DEPTH = NUM_ROWS * NUM_COLS  # no game lasts longer
+MAX_UNTIMED_DEPTH = 10  # deeper searches must have a time budget, so a request cannot run for minutes
+MAX_TIME_BUDGET_MS = 10000
+
+WIN_SCORE = 1000000  # large enough to always be the preferred outcome
@@ -0,0 +1,238 @@
+# Connect 4 opening book: the engine's move for every position in the first few moves of a game,
+# searched offline so the most expensive searches of a game are answered by a lookup.
+# Generate it from the /backend folder with:
+#   python -m ai.game_pigeon.connect4.opening_book --plies 4 --depth 10
+#
+# Layout (all integers native byte order):
+#   header:  magic (8s), format version (I), plies (I), search depth (I), entry count (I)
+#   keys:    one uint64 position key per entry, sorted
+#   moves:   one uint8 column per entry, in key order
+
+import argparse
+import logging
+import struct
+import time
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from ai.game_pigeon.connect4.bitboard import Bitboard, COLUMN_BITS, has_four
+from ai.game_pigeon.connect4.constants import NUM_ROWS, NUM_COLS
+
+MAGIC = b'C4BOOK\x00\x00'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('=8sIIII')
+
+DEFAULT_BOOK_PATH = 'data/connect4_book.bin'
+
+COLUMN_MASK = (1 << COLUMN_BITS) - 1
+BOTTOM_MASK = sum(1 << (col * COLUMN_BITS) for col in range(NUM_COLS))
+
+
+def position_key(mover: int, other: int) -> int:
+	"""
+	Encodes a position in 49 bits. Adding the bottom row to the occupied cells leaves one bit set above the
+	pieces of each column, marking its height, so adding the pieces of the player to move makes the key unique.
+
+	Parameters:
+		mover (int): The pieces of the player to move.
+		other (int): The pieces of the other player.
+
+	Returns:
+		int: The position key.
+	"""
+	return mover + (mover | other) + BOTTOM_MASK
+
+
+def mirror(pieces: int) -> int:
+	"""Reflects a player's pieces left to right"""
+	mirrored = 0
+	for col in range(NUM_COLS):
+		mirrored |= ((pieces >> (col * COLUMN_BITS)) & COLUMN_MASK) << ((NUM_COLS - 1 - col) * COLUMN_BITS)
+	return mirrored
+
+
+def canonical_key(mover: int, other: int) -> Tuple[int, bool]:
+	"""
+	Folds a position and its mirror image together.
+
+	Returns:
+		Tuple[int, bool]: The smaller of the position's key and its mirror image's key, and whether it is the mirror image's.
+	"""
+	key = position_key(mover, other)
+	mirrored_key = position_key(mirror(mover), mirror(other))
+	return (mirrored_key, True) if mirrored_key < key else (key, False)
+
+
+class OpeningBook:
+	"""
+	Moves for opening positions, keyed by canonical position key.
+
+	Attributes:
+		moves (Dict[int, int]): The column to play, for the canonical orientation of each position.
+		plies (int): The book holds every position with at most this many pieces.
+		search_depth (int): The depth each position was searched to.
+	"""
+
+	def __init__(self, moves: Dict[int, int], plies: int, search_depth: int):
+		self.moves = moves
+		self.plies = plies
+		self.search_depth = search_depth
+
+	def __len__(self) -> int:
+		return len(self.moves)
+
+	def lookup(self, mover: int, other: int) -> Optional[int]:
+		"""
+		Parameters:
+			mover (int): The pieces of the player to move.
+			other (int): The pieces of the other player.
+
+		Returns:
+			int | None: The column to play, or None if the position is not in the book.
+		"""
+		key, is_mirrored = canonical_key(mover, other)
+		move = self.moves.get(key)
+		if move is None:
+			return None
+		return NUM_COLS - 1 - move if is_mirrored else move
+
+	def save(self, path: str = DEFAULT_BOOK_PATH) -> None:
+		keys = np.array(sorted(self.moves), dtype=np.uint64)
+		moves = np.array([self.moves[key] for key in keys.tolist()], dtype=np.uint8)
+		with open(_resolve(path), 'wb') as file:
+			file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self.plies, self.search_depth, len(keys)))
+			file.write(keys.tobytes())
+			file.write(moves.tobytes())
+
+	@classmethod
+	def load(cls, path: str = DEFAULT_BOOK_PATH) -> 'OpeningBook':
+		"""
+		Raises:
+			ValueError: If the file is not an opening book of this format version.
+		"""
+		data = _resolve(path).read_bytes()
+		if len(data) < _HEADER.size:
+			raise ValueError(f"{path} is not a Connect 4 opening book.")
+		magic, version, plies, search_depth, count = _HEADER.unpack_from(data)
+		if magic != MAGIC or version != FORMAT_VERSION or len(data) != _HEADER.size + count * 9:
+			raise ValueError(f"{path} is not a Connect 4 opening book of format version {FORMAT_VERSION}.")
+		keys = np.frombuffer(data, dtype=np.uint64, count=count, offset=_HEADER.size)
+		moves = np.frombuffer(data, dtype=np.uint8, count=count, offset=_HEADER.size + count * 8)
+		return cls(dict(zip(keys.tolist(), moves.tolist())), plies, search_depth)
+
+
+def _resolve(file_path: str) -> Path:
+	"""Resolves a path relative to the /backend folder."""
+	return Path(__file__).parent.parent.parent.parent / file_path
+
+
+def opening_positions(plies: int) -> Dict[int, List[int]]:
+	"""
+	Lists every position reachable in at most `plies` moves in which nobody has won yet, folded with its mirror image.
+
+	Returns:
+		Dict[int, List[int]]: A sequence of moves reaching each position, by canonical key.
+	"""
+	positions: Dict[int, List[int]] = {}
+	position = Bitboard()
+	moves: List[int] = []
+
+	def visit(mover: int) -> None:
+		other = 1 - mover
+		key, _ = canonical_key(position.pieces[mover], position.pieces[other])
+		if key in positions:
+			return  # its continuations were listed from the first visit
+		positions[key] = list(moves)
+		if len(moves) == plies:
+			return
+		for col in position.valid_moves():
+			position.play(col, mover)
+			moves.append(col)
+			if not has_four(position.pieces[mover]):
+				visit(other)
+			moves.pop()
+			position.undo(col, mover)
+
+	visit(0)
+	return positions
+
+
+def generate_book(plies: int, search_depth: int, on_progress: Optional[Callable[[int, int], None]] = None) -> OpeningBook:
+	"""
+	Searches every opening position with the engine.
+
+	Parameters:
+		plies (int): Include every position with at most this many pieces.
+		search_depth (int): The depth to search each position to.
+		on_progress (Optional[Callable[[int, int], None]]): Called with (positions done, total) after each search.
+
+	Returns:
+		OpeningBook: The book.
+	"""
+	# imported here, since the strategy imports this module to read the book
+	from ai.game_pigeon.connect4.connect4_strategy import Connect4Strategy
+	from ai.game_pigeon.connect4.enums import BoardSpace
+	from ai.game_pigeon.connect4.transposition_table import TranspositionTable
+
+	positions = opening_positions(plies)
+	# one table for every search, since later positions share most of their subtrees with earlier ones
+	table = TranspositionTable(1 << 20)
+	book_moves: Dict[int, int] = {}
+	for done, (key, moves) in enumerate(positions.items(), start=1):
+		# replay the moves with the player to move as the AI (red, index 0)
+		position = Bitboard()
+		for ply, col in enumerate(moves):
+			position.play(col, (len(moves) - ply) % 2)
+		_, is_mirrored = canonical_key(position.pieces[0], position.pieces[1])
+		move = Connect4Strategy(BoardSpace.RED, table).search(position, search_depth)
+		if move is not None:
+			book_moves[key] = NUM_COLS - 1 - move if is_mirrored else move
+		if on_progress is not None:
+			on_progress(done, len(positions))
+	return OpeningBook(book_moves, plies, search_depth)
+
+
+_book: Optional[OpeningBook] = None
+
+
+def load_opening_book(path: str = DEFAULT_BOOK_PATH) -> Optional[OpeningBook]:
+	"""
+	Loads the opening book for `get_opening_book`. The server runs this at startup. Without a book file,
+	every position is searched.
+
+	Returns:
+		OpeningBook | None: The book, or None if there is no valid book file.
+	"""
+	global _book
+	try:
+		_book = OpeningBook.load(path)
+		logging.info(f"Loaded a Connect 4 opening book of {len(_book)} positions searched to depth {_book.search_depth}.")
+	except (OSError, ValueError):
+		logging.warning("No Connect 4 opening book loaded, every position will be searched.", exc_info=True)
+		_book = None
+	return _book
+
+
+def get_opening_book() -> Optional[OpeningBook]:
+	"""
+	Returns:
+		OpeningBook | None: The book loaded by `load_opening_book`, if any.
+	"""
+	return _book
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--plies', type=int, default=4, help="include positions with at most this many pieces")
+	parser.add_argument('--depth', type=int, default=10, help="search depth for each position")
+	parser.add_argument('--output', default=DEFAULT_BOOK_PATH)
+	args = parser.parse_args()
+	start = time.perf_counter()
+
+	def report(done: int, total: int) -> None:
+		if done % 100 == 0 or done == total:
+			print(f"{done}/{total} positions searched ({time.perf_counter() - start:.0f}s)")
+
+	book = generate_book(args.plies, args.depth, report)
+	book.save(args.output)
+	print(f"Wrote {len(book)} positions to {args.output}")
@@ -0,0 +1,99 @@
+# Transposition table for the Connect 4 search
+#
+# Positions are identified by Zobrist hashes: every (player, cell) pair has a random 64 bit key, and a position's
+# hash is the XOR of the keys of its pieces, so making or unmaking a move updates it with a single XOR.
+
+import random
+from typing import List, Optional, Tuple
+from utils.lru_cache import CacheStats
+from ai.game_pigeon.connect4.constants import NUM_ROWS, NUM_COLS
+
+# fixed seed so hashes, and so searches, are reproducible
+_zobrist_random = random.Random(0xC0FFEE)
+ZOBRIST_KEYS = [[_zobrist_random.getrandbits(64) for _ in range(NUM_COLS * (NUM_ROWS + 1))] for _ in range(2)]
+# mixed into the key when the maximizing player is to move, since the same pieces can be reached with either player to move
+MAXIMIZING_KEY = _zobrist_random.getrandbits(64)
+
+# bound types: how a stored score relates to the position's true score at the stored depth
+EXACT = 0
+LOWER_BOUND = 1  # the search failed high, the true score is at least this
+UPPER_BOUND = 2  # the search failed low, the true score is at most this
+
+# (key, depth, bound, score, best move, generation)
+Entry = Tuple[int, int, int, int, Optional[int], int]
+
+
+class TranspositionTable:
+	"""
+	A fixed size table of search results, indexed by the low bits of the position hash.
+	Each slot holds one entry. A new result replaces the slot's entry if that entry is for the same position,
+	is left over from an earlier search, or was searched less deeply; otherwise the deeper result is kept.
+
+	Attributes:
+		max_size (int): The number of slots, a power of two.
+	"""
+
+	def __init__(self, max_size: int):
+		# round down to a power of two, so a slot is picked with a mask
+		self.max_size = 1 << (max(max_size, 1).bit_length() - 1)
+		self._mask = self.max_size - 1
+		self._entries: List[Optional[Entry]] = [None] * self.max_size
+		self._generation = 0
+		self._size = 0
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+	def new_search(self) -> None:
+		"""Marks the entries stored so far as old, so the next search may replace them freely."""
+		self._generation += 1
+
+	def probe(self, key: int) -> Optional[Entry]:
+		"""
+		Parameters:
+			key (int): The position's hash.
+
+		Returns:
+			Entry | None: The stored (key, depth, bound, score, best move, generation), or None if the position is not stored.
+		"""
+		entry = self._entries[key & self._mask]
+		if entry is not None and entry[0] == key:
+			self._hits += 1
+			return entry
+		self._misses += 1
+		return None
+
+	def store(self, key: int, depth: int, bound: int, score: int, best_move: Optional[int]) -> None:
+		"""
+		Stores a search result, subject to the replacement policy.
+
+		Parameters:
+			key (int): The position's hash.
+			depth (int): The number of moves searched below the position.
+			bound (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+			score (int): The score found.
+			best_move (Optional[int]): The best move found, or None.
+		"""
+		slot = key & self._mask
+		entry = self._entries[slot]
+		if entry is None:
+			self._size += 1
+		elif entry[0] != key:
+			if entry[5] == self._generation and entry[1] > depth:
+				return  # keep the deeper result of this search
+			self._evictions += 1
+		self._entries[slot] = (key, depth, bound, score, best_move, self._generation)
+
+	def clear(self) -> None:
+		"""Drops every entry. The counters are kept."""
+		self._entries = [None] * self.max_size
+		self._size = 0
+
+	def stats(self) -> CacheStats:
+		return CacheStats(
+			hits=self._hits,
+			misses=self._misses,
+			evictions=self._evictions,
+			size=self._size,
+			max_size=self.max_size
+		)
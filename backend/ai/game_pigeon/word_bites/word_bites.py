@@ -2,17 +2,24 @@
 # 3.12.2021
 # Tool for Game Pigeon's 'Word Bites' puzzle game
 
-from utils.data_store import get_words_tree
+from utils.data_store import get_words_tree, get_word_index
 from utils.error import BackendError
-from utils.word_games.words_tree_node import WordsTreeNode
+from utils.word_games.dawg import Dawg, ROOT, NO_NODE, encode_word, letter_code
+from utils.word_games.word_index import WordIndex, letters_mask
 from functools import cmp_to_key
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
+import numpy as np
 
 DEFAULT_MIN_LENGTH = 3
 DEFAULT_MAX_HORIZONTAL_LENGTH = 8
 DEFAULT_MAX_VERTICAL_LENGTH = 9
 
+# From this many pieces on, run() checks every dictionary word that fits the pieces' letters instead of
+# growing words piece by piece, whose search grows with the number of piece orderings
+# (see benchmarks/word_bites_engines.py)
+WORD_FIRST_MIN_PIECES = 11
+
 
 @dataclass(frozen=True)
 class SolutionPiece:
@@ -54,23 +61,73 @@ def build_word_bites_solutions(solutions_list: List[List[SolutionPiece]], is_hor
 
 
 
+@dataclass(frozen=True)
+class PieceMove:
+	"""
+	One way to add a piece to a word.
+
+	Attributes:
+		codes (Tuple[int, ...]): The letter codes the piece adds to the word.
+		solution_piece (SolutionPiece): How the piece is recorded in a solution.
+	"""
+	codes: Tuple[int, ...]
+	solution_piece: SolutionPiece
+
+
+def build_piece_moves(
+		single_pieces: List[str],
+		one_of_pieces: List[str],
+		both_of_pieces: List[str]
+	) -> Tuple[List[Tuple[PieceMove, ...]], List[bool]]:
+	"""
+	Lists the moves of every piece for one direction, with identical pieces next to each other.
+
+	Parameters:
+		single_pieces (List[str]): List of single letter pieces.
+		one_of_pieces (List[str]): List of pieces in which only one letter can be used if part of solution.
+		both_of_pieces (List[str]): List of pieces in which both letters must be used if part of solution.
+
+	Returns:
+		Tuple[List[Tuple[PieceMove, ...]], List[bool]]: The moves of each piece, and whether each piece
+			is identical to the one before it.
+	"""
+	pieces = []
+	for letter in sorted(single_pieces):
+		pieces.append(('single', letter, [PieceMove((letter_code(letter),), SolutionPiece(letter, [0]))]))
+	for piece in sorted(one_of_pieces):
+		# letter_index 0 is first letter, 1 is second letter. A piece like "ee" only needs one branch.
+		letter_indices = [0] if piece[0] == piece[1] else [0, 1]
+		pieces.append(('one_of', piece, [
+			PieceMove((letter_code(piece[letter_index]),), SolutionPiece(piece, [letter_index]))
+			for letter_index in letter_indices
+		]))
+	for piece in sorted(both_of_pieces):
+		pieces.append(('both_of', piece, [PieceMove(tuple(encode_word(piece)), SolutionPiece(piece, [0, 1]))]))
+
+	# a letter outside a-z is in no word, so drop the moves that place one
+	moves = [tuple(move for move in piece_moves if -1 not in move.codes) for _, _, piece_moves in pieces]
+
+	same_as_previous = [index > 0 and pieces[index][:2] == pieces[index - 1][:2] for index in range(len(pieces))]
+	return moves, same_as_previous
+
+
 def find_words(
 		single_pieces: List[str],
 		horizontal_pieces: List[str],
 		vertical_pieces: List[str],
-		root_node: WordsTreeNode,
+		tree: Dawg,
 		min_length: Optional[int],
 		horizontal_max_length: Optional[int],
 		vertical_max_length: Optional[int]
 ) -> List[WordBitesSolution]:
 	"""
-	Find all the valid words for a board given the pieces and the root node of the words tree.
+	Find all the valid words for a board given the pieces and the word graph.
 
 	Parameters:
 		single_pieces (List[str]): List of single letter pieces.
 		horizontal_pieces (List[str]): List of horizontal letter groupings (each is 2 letters).
 		vertical_pieces (List[str]): List of vertical letter groupings (each is 2 letters).
-		root_node (WordsTreeNode): The root node of the words tree.
+		tree (Dawg): The word graph.
 		min_length (Optional[int]): The minimum length of words to consider.
 		horizontal_max_length (Optional[int]): The maximum length of horizontal words.
 		vertical_max_length (Optional[int]): The maximum length of vertical words.
@@ -80,8 +137,7 @@ def find_words(
 		single_pieces=single_pieces, 
 		one_of_pieces=vertical_pieces, 
 		both_of_pieces=horizontal_pieces, 
-		solution_pieces=[], 
-		current_node=root_node,
+		tree=tree,
 		min_length=min_length, 
 		max_length=horizontal_max_length
 	)
@@ -89,8 +145,7 @@ def find_words(
 		single_pieces=single_pieces, 
 		one_of_pieces=horizontal_pieces, 
 		both_of_pieces=vertical_pieces, 
-		solution_pieces=[], 
-		current_node=root_node,
+		tree=tree,
 		min_length=min_length, 
 		max_length=vertical_max_length
 	)
@@ -103,8 +158,7 @@ def find_words_in_direction(
 		single_pieces: List[str], 
 		one_of_pieces: List[str], 
 		both_of_pieces: List[str], 
-		solution_pieces: List[SolutionPiece],
-		current_node: WordsTreeNode,
+		tree: Dawg,
 		min_length: Optional[int],
 		max_length: Optional[int]
 	) -> List[List[SolutionPiece]]:
@@ -115,63 +169,248 @@ def find_words_in_direction(
 		single_pieces (List[str]): List of single letter pieces.
 		one_of_pieces (List[str]): List of pieces in which only one letter can be used if part of solution.
 		both_of_pieces (List[str]): List of pieces in which both letters must be used if part of solution.
-		solution_pieces (List[SolutionPiece]): The current solution pieces being formed.
-		current_node (WordsTreeNode): The current node in the words tree.
+		tree (Dawg): The word graph.
 		min_length (Optional[int]): The minimum length of words to consider.
 		max_length (Optional[int]): The maximum length of words to consider.
 	Returns:
 		List[List[SolutionPiece]]: List of solutions represented as lists of SolutionPiece.
 	"""
-	if current_node is None:
-		return []
-	
+	moves, same_as_previous = build_piece_moves(single_pieces, one_of_pieces, both_of_pieces)
+	longest = len(single_pieces) + len(one_of_pieces) + 2 * len(both_of_pieces)
+	if max_length is not None:
+		longest = min(longest, max_length)
 	solutions = []
-	if current_node.isEndOfWord():
-		word_length = sum(len(piece.indices_in_use) for piece in solution_pieces)
-		if max_length is not None and word_length > max_length:
-			return []
-		elif min_length is None or word_length >= min_length:
-			# shallow copy is okay because SolutionPiece is immutable
-			solutions.append(solution_pieces.copy())
-
-	for piece_index, letter in enumerate(single_pieces):
-		new_single_pieces = single_pieces[:piece_index] + single_pieces[piece_index+1:]
-		next_node = current_node.getChild(letter)
-		new_solution_pieces = solution_pieces.copy()
-		new_solution_pieces.append(SolutionPiece(letters=letter, indices_in_use=[0]))
-		solutions_from_expansion = find_words_in_direction(
-			new_single_pieces, one_of_pieces, both_of_pieces, new_solution_pieces, next_node, min_length, max_length
-		)
-		solutions.extend(solutions_from_expansion)
-	
-	for piece_index, piece in enumerate(one_of_pieces):
-		new_one_of_pieces = one_of_pieces[:piece_index] + one_of_pieces[piece_index+1:]
-		for letter_index in range(2):
-			# letter_index 0 is first letter, 1 is second letter
-			next_node = current_node.getChild(piece[letter_index])
-			new_solution_pieces = solution_pieces.copy()
-			new_solution_pieces.append(SolutionPiece(letters=piece, indices_in_use=[letter_index]))
-			solutions_from_expansion = find_words_in_direction(
-				single_pieces, new_one_of_pieces, both_of_pieces, new_solution_pieces, next_node, min_length, max_length
-			)
-			solutions.extend(solutions_from_expansion)
+	extend_word(
+		moves,
+		same_as_previous,
+		0,
+		0,
+		ROOT,
+		[],
+		tree,
+		min_length or 0,
+		longest,
+		solutions
+	)
+	return solutions
+
+
+def extend_word(
+		moves: List[Tuple[PieceMove, ...]],
+		same_as_previous: List[bool],
+		used: int,
+		length: int,
+		current_node: int,
+		solution_pieces: List[SolutionPiece],
+		tree: Dawg,
+		min_length: int,
+		max_length: int,
+		solutions: List[List[SolutionPiece]]
+	) -> None:
+	"""
+	Extend a partial word with each unused piece, backtracking in place: `solution_pieces` is restored before returning.
+	Of several identical pieces, only the first unused one is tried, so each multiset of pieces is explored once,
+	and a piece is only added if the word graph has a word of an allowed length below the node it leads to.
+
+	Parameters:
+		moves (List[Tuple[PieceMove, ...]]): The moves of each piece, see `build_piece_moves`.
+		same_as_previous (List[bool]): Whether each piece is identical to the one before it.
+		used (int): Bitmask of the pieces in the current word.
+		length (int): The length of the current word.
+		current_node (int): The current node in the word graph.
+		solution_pieces (List[SolutionPiece]): The current solution pieces being formed.
+		tree (Dawg): The word graph.
+		min_length (int): The minimum length of words to consider.
+		max_length (int): The maximum length of words to consider.
+		solutions (List[List[SolutionPiece]]): Found solutions are appended here.
+	"""
+	if tree.is_end_of_word(current_node) and length >= min_length:
+		# shallow copy is okay because SolutionPiece is immutable
+		solutions.append(solution_pieces.copy())
 
-	for piece_index, piece in enumerate(both_of_pieces):
-		new_both_of_pieces = both_of_pieces[:piece_index] + both_of_pieces[piece_index+1:]
-		intermediate_node = current_node.getChild(piece[0])
-		if intermediate_node is None:
+	for piece_index, piece_moves in enumerate(moves):
+		if used >> piece_index & 1:
 			continue
-		next_node = intermediate_node.getChild(piece[1])
-		new_solution_pieces = solution_pieces.copy()
-		new_solution_pieces.append(SolutionPiece(letters=piece, indices_in_use=[0, 1]))
-		solutions_from_expansion = find_words_in_direction(
-			single_pieces, one_of_pieces, new_both_of_pieces, new_solution_pieces, next_node, min_length, max_length
-		)
-		solutions.extend(solutions_from_expansion)
+		if same_as_previous[piece_index] and not used >> (piece_index - 1) & 1:
+			continue  # an identical piece is still unused, so this branch is covered by that one
+		for move in piece_moves:
+			next_length = length + len(move.codes)
+			if next_length > max_length:
+				continue
+			next_node = current_node
+			for code in move.codes:
+				next_node = tree.child(next_node, code)
+				if next_node == NO_NODE:
+					break
+			if next_node == NO_NODE:
+				continue
+			if (next_length + tree.min_suffix_length[next_node] > max_length
+					or next_length + tree.max_suffix_length[next_node] < min_length):
+				continue  # every word below is too long or too short
+			solution_pieces.append(move.solution_piece)
+			extend_word(
+				moves,
+				same_as_previous,
+				used | 1 << piece_index,
+				next_length,
+				next_node,
+				solution_pieces,
+				tree,
+				min_length,
+				max_length,
+				solutions
+			)
+			solution_pieces.pop()
+
 
+def find_words_word_first(
+		single_pieces: List[str],
+		horizontal_pieces: List[str],
+		vertical_pieces: List[str],
+		index: WordIndex,
+		min_length: Optional[int],
+		horizontal_max_length: Optional[int],
+		vertical_max_length: Optional[int]
+) -> List[WordBitesSolution]:
+	"""
+	Find the valid words for a board by checking which dictionary words the pieces can spell, rather than
+	growing words from the pieces. Gives the same result as `find_words` once deduplicated by `run`.
+
+	Parameters:
+		single_pieces (List[str]): List of single letter pieces.
+		horizontal_pieces (List[str]): List of horizontal letter groupings (each is 2 letters).
+		vertical_pieces (List[str]): List of vertical letter groupings (each is 2 letters).
+		index (WordIndex): The word metadata index.
+		min_length (Optional[int]): The minimum length of words to consider.
+		horizontal_max_length (Optional[int]): The maximum length of horizontal words.
+		vertical_max_length (Optional[int]): The maximum length of vertical words.
+	"""
+	solutions = []
+	horizontal_solutions = find_words_in_direction_word_first(
+		single_pieces=single_pieces,
+		one_of_pieces=vertical_pieces,
+		both_of_pieces=horizontal_pieces,
+		index=index,
+		min_length=min_length,
+		max_length=horizontal_max_length
+	)
+	vertical_solutions = find_words_in_direction_word_first(
+		single_pieces=single_pieces,
+		one_of_pieces=horizontal_pieces,
+		both_of_pieces=vertical_pieces,
+		index=index,
+		min_length=min_length,
+		max_length=vertical_max_length
+	)
+	solutions.extend(build_word_bites_solutions(horizontal_solutions, is_horizontal=True))
+	solutions.extend(build_word_bites_solutions(vertical_solutions, is_horizontal=False))
+	return solutions
+
+
+def find_words_in_direction_word_first(
+		single_pieces: List[str],
+		one_of_pieces: List[str],
+		both_of_pieces: List[str],
+		index: WordIndex,
+		min_length: Optional[int],
+		max_length: Optional[int]
+	) -> List[List[SolutionPiece]]:
+	"""
+	Find the valid words for a board in a certain direction, one solution per word.
+	Candidate words are those whose letter counts fit within what the pieces could supply, and each
+	candidate is then assigned pieces exactly.
+
+	Parameters:
+		single_pieces (List[str]): List of single letter pieces.
+		one_of_pieces (List[str]): List of pieces in which only one letter can be used if part of solution.
+		both_of_pieces (List[str]): List of pieces in which both letters must be used if part of solution.
+		index (WordIndex): The word metadata index.
+		min_length (Optional[int]): The minimum length of words to consider.
+		max_length (Optional[int]): The maximum length of words to consider.
+	Returns:
+		List[List[SolutionPiece]]: List of solutions represented as lists of SolutionPiece.
+	"""
+	# letters the singles and the both-of pieces supply, and the letters the one-of pieces could add,
+	# each one-of piece adding one letter at most. Letters outside a-z (code -1) are in no word, so they
+	# supply nothing; indexing with -1 would count them as 'z'.
+	fixed_supply = np.zeros(26, dtype=np.int16)
+	for piece in single_pieces + both_of_pieces:
+		for code in encode_word(piece):
+			if code != -1:
+				fixed_supply[code] += 1
+	one_of_supply = np.zeros(26, dtype=np.int16)
+	for piece in one_of_pieces:
+		for code in set(encode_word(piece)):
+			if code != -1:
+				one_of_supply[code] += 1
+	longest = len(single_pieces) + 2 * len(both_of_pieces) + len(one_of_pieces)
+	if max_length is not None:
+		longest = min(longest, max_length)
+
+	candidates = np.flatnonzero(
+		index.subset_of(letters_mask(''.join(single_pieces + one_of_pieces + both_of_pieces)))
+		& (index.lengths >= (min_length or 1))
+		& (index.lengths <= longest)
+	)
+	shortfall = np.maximum(index.letter_counts[candidates].astype(np.int16) - fixed_supply, 0)
+	candidates = candidates[
+		np.all(shortfall <= one_of_supply, axis=1) & (shortfall.sum(axis=1) <= len(one_of_pieces))
+	]
+
+	moves, same_as_previous = build_piece_moves(single_pieces, one_of_pieces, both_of_pieces)
+	# the moves starting with each letter, in the reverse of extend_word's order
+	moves_by_letter = [[] for _ in range(26)]
+	for piece_index in range(len(moves) - 1, -1, -1):
+		for move in reversed(moves[piece_index]):
+			moves_by_letter[move.codes[0]].append((piece_index, move))
+
+	solutions = []
+	for word_id in candidates.tolist():
+		solution_pieces = []
+		if cover_word(encode_word(index.words[word_id]), 0, moves_by_letter, same_as_previous, 0, solution_pieces):
+			solutions.append(solution_pieces)
 	return solutions
 
 
+def cover_word(
+		codes: List[int],
+		position: int,
+		moves_by_letter: List[List[Tuple[int, PieceMove]]],
+		same_as_previous: List[bool],
+		used: int,
+		solution_pieces: List[SolutionPiece]
+	) -> bool:
+	"""
+	Assign pieces to the rest of a word, each piece used at most once.
+	Pieces are tried in the reverse of `extend_word`'s order, so the assignment found is the one
+	`extend_word` would find last, which is the one `run` keeps after deduplicating.
+
+	Parameters:
+		codes (List[int]): The letter codes of the word.
+		position (int): The position in the word to cover from.
+		moves_by_letter (List[List[Tuple[int, PieceMove]]]): The (piece index, move) pairs starting with each letter.
+		same_as_previous (List[bool]): Whether each piece is identical to the one before it.
+		used (int): Bitmask of the pieces already assigned.
+		solution_pieces (List[SolutionPiece]): The pieces assigned so far. Holds the full assignment if one is found.
+	Returns:
+		bool: Whether the rest of the word could be covered.
+	"""
+	if position == len(codes):
+		return True
+	for piece_index, move in moves_by_letter[codes[position]]:
+		if used >> piece_index & 1:
+			continue
+		if same_as_previous[piece_index] and not used >> (piece_index - 1) & 1:
+			continue
+		if len(move.codes) == 2 and (position + 1 == len(codes) or codes[position + 1] != move.codes[1]):
+			continue
+		solution_pieces.append(move.solution_piece)
+		if cover_word(codes, position + len(move.codes), moves_by_letter, same_as_previous, used | 1 << piece_index, solution_pieces):
+			return True
+		solution_pieces.pop()
+	return False
+
+
 def word_compare(a: WordBitesSolution, b: WordBitesSolution) -> int:
 	"""
 	Compare two words for sorting. Prioritize longer solutions, then alphabetically.
@@ -212,6 +451,21 @@ def transform_to_dict(solutions: List[WordBitesSolution]) -> List[dict]:
 	]
 
 
+def rank_solutions(solutions: List[WordBitesSolution]) -> List[dict]:
+	"""
+	Deduplicate solutions by word, keeping the last one found, and sort them longest first.
+
+	Parameters:
+		solutions (List[WordBitesSolution]): The solutions found.
+
+	Returns:
+		List[dict]: The sorted solutions, as dictionaries.
+	"""
+	deduped_solutions = list({s.word: s for s in solutions}.values())
+	ordered_solutions = sorted(deduped_solutions, key=cmp_to_key(word_compare))
+	return transform_to_dict(ordered_solutions)
+
+
 def validate_input(single_pieces: List[str], horizontal_pieces: List[str], vertical_pieces: List[str]):
 	"""
 	Validate the input pieces for the Word Bites solver.
@@ -224,14 +478,15 @@ def validate_input(single_pieces: List[str], horizontal_pieces: List[str], verti
 	Raises:
 		BackendError: If any input is invalid.
 	"""
+	# letter_code is -1 for anything outside a-z, e.g. 'é', which passes isalpha and islower
 	for piece in single_pieces:
-		if not piece.isalpha() or not piece.islower() or len(piece) != 1:
+		if len(piece) != 1 or letter_code(piece) == -1:
 			raise BackendError(ValueError(f"Invalid single letter piece: {piece}. Each piece must be a single lowercase letter."))
 	for piece in horizontal_pieces:
-		if not piece.isalpha() or not piece.islower() or len(piece) != 2:
+		if len(piece) != 2 or -1 in encode_word(piece):
 			raise BackendError(ValueError(f"Invalid horizontal piece: {piece}. Each piece must be two lowercase letters."))
 	for piece in vertical_pieces:
-		if not piece.isalpha() or not piece.islower() or len(piece) != 2:
+		if len(piece) != 2 or -1 in encode_word(piece):
 			raise BackendError(ValueError(f"Invalid horizontal piece: {piece}. Each piece must be two lowercase letters."))
 
 
@@ -255,15 +510,25 @@ def run(
 		vertical_max_length (int): The maximum length of vertical words.
 	"""
 	validate_input(single_pieces, horizontal_pieces, vertical_pieces)
-	solutions = find_words(
-		single_pieces=single_pieces,
-		horizontal_pieces=horizontal_pieces,
-		vertical_pieces=vertical_pieces,
-		root_node=get_words_tree(),
-		min_length=min_length,
-		horizontal_max_length=horizontal_max_length,
-		vertical_max_length=vertical_max_length
-	)
-	deduped_solutions = list({s.word: s for s in solutions}.values())
-	ordered_solutions = sorted(deduped_solutions, key=cmp_to_key(word_compare))
-	return transform_to_dict(ordered_solutions)
+	num_pieces = len(single_pieces) + len(horizontal_pieces) + len(vertical_pieces)
+	if num_pieces >= WORD_FIRST_MIN_PIECES:
+		solutions = find_words_word_first(
+			single_pieces=single_pieces,
+			horizontal_pieces=horizontal_pieces,
+			vertical_pieces=vertical_pieces,
+			index=get_word_index(),
+			min_length=min_length,
+			horizontal_max_length=horizontal_max_length,
+			vertical_max_length=vertical_max_length
+		)
+	else:
+		solutions = find_words(
+			single_pieces=single_pieces,
+			horizontal_pieces=horizontal_pieces,
+			vertical_pieces=vertical_pieces,
+			tree=get_words_tree(),
+			min_length=min_length,
+			horizontal_max_length=horizontal_max_length,
+			vertical_max_length=vertical_max_length
+		)
+	return rank_solutions(solutions)
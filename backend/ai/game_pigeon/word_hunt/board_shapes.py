@@ -0,0 +1,183 @@
+from utils.error import BackendError
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import List, Optional, Tuple
+import re
+
+# Board shapes are defined as data: a grid of rows where '#' is a cell and '.' is a hole.
+# Cells are numbered left to right, top to bottom, skipping holes, and two cells are
+# adjacent if they touch horizontally, vertically or diagonally on the grid.
+#
+#	##.##		 ___________    ___________	<-- board index layout of the cross board
+#	#####		|__0_|__1_|____|__2_|__3_|
+#	.###.		|__4_|__5_|__6_|__7_|__8_|
+#	#####		 ____|__9_|_10_|_11_|____
+#	##.##		|_12_|_13_|_14_|_15_|_16_|
+#				|_17_|_18_|    |_19_|_20_|
+
+CELL = '#'
+HOLE = '.'
+
+# (row, column) offsets of the neighbors of a cell, clockwise from the upper left
+#	_____________
+#	|_0_|_1_|_2_|	<-- direction layout
+#	|_7_|_X_|_3_|
+#	|_6_|_5_|_4_|
+DIRECTION_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)]
+
+MAX_BOARD_CELLS = 256  # e.g. 16x16, keeps the visited bitmask and search time reasonable
+
+
+@dataclass(frozen=True)
+class BoardShape:
+	"""
+	A Word Hunt board layout.
+
+	Attributes:
+		name (str): Name of the board type.
+		cell_mask (Tuple[str, ...]): The rows of the layout grid, '#' for a cell and '.' for a hole.
+	"""
+	name: str
+	cell_mask: Tuple[str, ...]
+
+	@cached_property
+	def cell_coordinates(self) -> Tuple[Tuple[int, int], ...]:
+		"""The (row, column) of each cell on the layout grid, in board index order."""
+		return tuple(
+			(row, col)
+			for row, line in enumerate(self.cell_mask)
+			for col, char in enumerate(line)
+			if char == CELL
+		)
+
+	@property
+	def num_cells(self) -> int:
+		return len(self.cell_coordinates)
+
+	@property
+	def row_sizes(self) -> List[int]:
+		return [line.count(CELL) for line in self.cell_mask]
+
+	@cached_property
+	def neighbor_table(self) -> Tuple[Tuple[int, ...], ...]:
+		"""
+		The adjacent positions of each position, in direction order. Derived from the layout once per shape.
+		"""
+		index_of = {coordinates: index for index, coordinates in enumerate(self.cell_coordinates)}
+		return tuple(
+			tuple(
+				index_of[(row + row_offset, col + col_offset)]
+				for row_offset, col_offset in DIRECTION_OFFSETS
+				if (row + row_offset, col + col_offset) in index_of
+			)
+			for row, col in self.cell_coordinates
+		)
+
+	@cached_property
+	def symmetries(self) -> Tuple[Tuple[int, ...], ...]:
+		"""
+		The rotations and reflections of the layout grid that map the board onto itself, as permutations:
+		`symmetry[i]` is the position that position `i` moves to. The identity comes first.
+		Adjacency is preserved by all of them, so a transformed board has the same words along transformed paths.
+		"""
+		num_rows = len(self.cell_mask)
+		num_cols = max((len(line) for line in self.cell_mask), default=0)
+		last_row, last_col = num_rows - 1, num_cols - 1
+		transforms = [
+			lambda row, col: (row, col),
+			lambda row, col: (row, last_col - col),
+			lambda row, col: (last_row - row, col),
+			lambda row, col: (last_row - row, last_col - col),
+			lambda row, col: (col, row),
+			lambda row, col: (col, last_row - row),
+			lambda row, col: (last_col - col, row),
+			lambda row, col: (last_col - col, last_row - row),
+		]
+		index_of = {coordinates: index for index, coordinates in enumerate(self.cell_coordinates)}
+		symmetries = []
+		for transform in transforms:
+			permutation = tuple(index_of.get(transform(row, col), -1) for row, col in self.cell_coordinates)
+			if -1 not in permutation and permutation not in symmetries:
+				symmetries.append(permutation)
+		return tuple(symmetries)
+
+
+@lru_cache(maxsize=64)
+def rectangle_shape(num_rows: int, num_cols: int) -> BoardShape:
+	"""
+	Parameters:
+		num_rows (int): The number of rows.
+		num_cols (int): The number of columns.
+
+	Returns:
+		BoardShape: A full rectangular board named "{num_rows}x{num_cols}".
+	"""
+	return BoardShape(f"{num_rows}x{num_cols}", tuple(CELL * num_cols for _ in range(num_rows)))
+
+
+SMALL_SQUARE_SHAPE = rectangle_shape(4, 4)
+LARGE_SQUARE_SHAPE = rectangle_shape(5, 5)
+CROSS_SHAPE = BoardShape("cross", (
+	"##.##",
+	"#####",
+	".###.",
+	"#####",
+	"##.##",
+))
+DONUT_SHAPE = BoardShape("donut", (
+	".###.",
+	"#####",
+	"##.##",
+	"#####",
+	".###.",
+))
+
+ALL_BOARD_SHAPES = {shape.name: shape for shape in [SMALL_SQUARE_SHAPE, LARGE_SQUARE_SHAPE, CROSS_SHAPE, DONUT_SHAPE]}
+
+_RECTANGLE_PATTERN = re.compile(r"^(\d+)x(\d+)$")
+
+
+def _validate_shape(shape: BoardShape) -> BoardShape:
+	"""
+	Raises:
+		BackendError: If the shape has no cells or too many cells.
+	"""
+	if shape.num_cells == 0:
+		raise BackendError(ValueError(f"Board {shape.name} has no cells."))
+	if shape.num_cells > MAX_BOARD_CELLS:
+		raise BackendError(ValueError(f"Board {shape.name} has {shape.num_cells} cells, the maximum is {MAX_BOARD_CELLS}."))
+	return shape
+
+
+def get_board_shape(board_type: str, board_mask: Optional[List[str]] = None) -> BoardShape:
+	"""
+	Get the board shape for a request.
+
+	Parameters:
+		board_type (str): A named board type ("4x4", "5x5", "cross", "donut"), any "{rows}x{cols}" rectangle,
+			or a name for the custom `board_mask`.
+		board_mask (Optional[List[str]]): A custom layout, one string per row with '#' for a cell and '.' for a hole.
+
+	Returns:
+		BoardShape: The board shape.
+	Raises:
+		BackendError: If the board type or mask is invalid.
+	"""
+	if board_mask is not None:
+		if sum(len(line) for line in board_mask) > MAX_BOARD_CELLS * 4:
+			raise BackendError(ValueError("Board mask is too large."))
+		if any(char not in (CELL, HOLE) for line in board_mask for char in line):
+			raise BackendError(ValueError(f"Invalid board mask: rows may only contain '{CELL}' and '{HOLE}'."))
+		return _validate_shape(BoardShape(board_type, tuple(board_mask)))
+
+	if board_type in ALL_BOARD_SHAPES:
+		return ALL_BOARD_SHAPES[board_type]
+
+	match = _RECTANGLE_PATTERN.match(board_type)
+	if match is not None:
+		num_rows, num_cols = int(match.group(1)), int(match.group(2))
+		if num_rows * num_cols > MAX_BOARD_CELLS:
+			raise BackendError(ValueError(f"Board {board_type} is too large, the maximum is {MAX_BOARD_CELLS} cells."))
+		return _validate_shape(rectangle_shape(num_rows, num_cols))
+
+	raise BackendError(ValueError(f"Invalid board type: {board_type}"))
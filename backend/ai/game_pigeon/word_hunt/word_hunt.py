@@ -4,37 +4,28 @@
 
 from utils.data_store import get_words_tree
 from utils.error import BackendError
-from ai.game_pigeon.word_hunt.small_square_board import SmallSquareBoard
-from ai.game_pigeon.word_hunt.large_square_board import LargeSquareBoard
-from ai.game_pigeon.word_hunt.donut_board import DonutBoard
-from ai.game_pigeon.word_hunt.cross_board import CrossBoard
-from ai.game_pigeon.word_hunt.board import Board
-from ai.game_pigeon.word_hunt.letter import Letter
-from utils.word_games.words_tree_node import WordsTreeNode
+from utils.lru_cache import CacheStats, LRUCache
+from utils.worker_pool import WORKER_POOL_SIZE, discard_worker_pool, get_worker_pool
+from ai.game_pigeon.word_hunt.board_shapes import BoardShape, get_board_shape
+from utils.word_games.dawg import Dawg, ROOT, NO_NODE, letter_code
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
 from functools import cmp_to_key
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Sequence, Set, Tuple
 from dataclasses import dataclass
-
-# Direction Constants #
-UP_LEFT = 0 	# _____________
-UP = 1 			# |_0_|_1_|_2_|	<-- direction layout
-UP_RIGHT = 2    # |_7_|_X_|_3_|
-RIGHT = 3 		# |_6_|_5_|_4_|
-DOWN_RIGHT = 4
-DOWN = 5
-DOWN_LEFT = 6
-LEFT = 7
-DIRECTIONS = [UP_LEFT, UP, UP_RIGHT, RIGHT, DOWN_RIGHT, DOWN, DOWN_LEFT, LEFT]
-########################
-ALL_BOARD_CLASSES = [
-	SmallSquareBoard, 
-	LargeSquareBoard, 
-	CrossBoard, 
-	DonutBoard
-]
+import heapq
+import os
 
 DEFAULT_MIN_LENGTH = 3
 
+# Number of solved boards kept, shared by all orientations of a board. 0 disables the cache.
+SOLUTION_CACHE_SIZE = int(os.getenv('WORD_HUNT_CACHE_SIZE', '256'))
+
+# Game Pigeon's Word Hunt points: 3 letters = 100, 4 = 400, 5 = 800, 6 = 1400, then +400 per extra letter
+SHORT_WORD_SCORES = {3: 100, 4: 400, 5: 800}
+SIX_LETTER_SCORE = 1400
+EXTRA_LETTER_SCORE = 400
+
 @dataclass
 class WordHuntSolution:
     """
@@ -59,88 +50,264 @@ def word_compare(a: WordHuntSolution, b: WordHuntSolution) -> int:
 			return 1
 
 
-def is_valid_next_move(letter: Letter) -> bool:
+def word_score(length: int) -> int:
 	"""
-	Check if the next move is valid based on the letter's position.
-
 	Parameters:
-		letter (Letter): The letter object to check.
+		length (int): The length of a word.
+
 	Returns:
-		bool: True if the move is valid, False otherwise.
+		int: The points Game Pigeon awards for a word of that length.
 	"""
-	return not letter.visited
+	if length >= 6:
+		return SIX_LETTER_SCORE + EXTRA_LETTER_SCORE * (length - 6)
+	return SHORT_WORD_SCORES.get(length, 0)
+
+
+class TopSolutions:
+	"""
+	Keeps the `limit` best distinct words found so far in a bounded min-heap, so the worst kept word is at the top.
+	Words rank by score, then by length, then alphabetically, which matches `word_compare`.
+
+	Attributes:
+		limit (int): The number of words to keep.
+		min_length_to_enter (int): Words shorter than this can no longer make the top `limit`.
+	"""
+
+	def __init__(self, limit: int):
+		self.limit = limit
+		self.min_length_to_enter = 0
+		self._heap: List[Tuple[int, int, Tuple[int, ...], WordHuntSolution]] = []
+		self._words: Set[str] = set()
+
+	def add(self, word: str, positions: List[int]) -> None:
+		if word in self._words:
+			return
+		# negated letter codes so that, within a length, the alphabetically last word is the smallest entry
+		entry = (word_score(len(positions)), len(positions), tuple(-ord(letter) for letter in word))
+		if len(self._heap) < self.limit:
+			heapq.heappush(self._heap, entry + (WordHuntSolution(word, positions.copy()),))
+		elif entry > self._heap[0][:3]:
+			evicted = heapq.heapreplace(self._heap, entry + (WordHuntSolution(word, positions.copy()),))
+			self._words.discard(evicted[3].word)
+		else:
+			return
+		self._words.add(word)
+		if len(self._heap) == self.limit:
+			worst_score = self._heap[0][0]
+			length = self._heap[0][1]
+			while length > 0 and word_score(length - 1) >= worst_score:
+				length -= 1
+			self.min_length_to_enter = length
+
+	def solutions(self) -> List[WordHuntSolution]:
+		"""The kept solutions, best first."""
+		return [entry[3] for entry in sorted(self._heap, key=lambda entry: entry[:3], reverse=True)]
 
 
 def find_valid_words(
-		board: Board, 
-		root_node: WordsTreeNode, 
-		min_length: Optional[int] = None
+		shape: BoardShape, 
+		letters: List[str],
+		tree: Dawg, 
+		min_length: Optional[int] = None,
+		start_positions: Optional[Sequence[int]] = None
 	) -> List[WordHuntSolution]:
 	"""
 	Find all valid words on the board starting from each letter.
 
 	Parameters:
-		board (Board): The board object containing letters.
-		root_node (WordsTreeNode): The root node of the words tree.
+		shape (BoardShape): The layout of the board.
+		letters (List[str]): The letter at each position of the board.
+		tree (Dawg): The word graph.
 		min_length (Optional[int]): The minimum length of words to consider.
+		start_positions (Optional[Sequence[int]]): Only find words starting at these positions. Defaults to all of them.
 	"""
+	neighbors = shape.neighbor_table
+	codes = [letter_code(letter) for letter in letters]
 	solutions = []
-	for letter in board.lb:
-		letter.markVisited()
-		solutions.extend(find_valid_from(
-			board, 
-			letter.char, 
-			letter, 
-			[letter.pos], 
-			root_node.getChild(letter.char), 
-			min_length
-		))
-		letter.visited = False  # so later iterations don't have it marked already
+	for pos in range(len(letters)) if start_positions is None else start_positions:
+		if codes[pos] == -1:
+			continue  # not a letter, so no word can use it
+		find_valid_from(
+			tree,
+			neighbors,
+			letters,
+			codes,
+			letters[pos],
+			[pos],
+			1 << pos,
+			tree.child(ROOT, codes[pos]),
+			min_length or 0,
+			solutions
+		)
 	return solutions
 
 
 def find_valid_from(
-		board: Board, 
+		tree: Dawg,
+		neighbors: Tuple[Tuple[int, ...], ...],
+		chars: List[str],
+		codes: List[int],
 		word: str, 
-		current_letter: Letter, 
 		positions: List[int], 
-		current_node: WordsTreeNode,
-		min_length: Optional[int] = None
-	) -> List[WordHuntSolution]:
+		visited: int,
+		current_node: int,
+		min_length: int,
+		solutions: List[WordHuntSolution]
+	) -> None:
 	"""
-	Find all valid words starting from a given letter.
+	Find all valid words starting from a given path, backtracking in place: `positions` is restored before returning.
+	Children are checked before descending, so missing words and subtrees whose words are all too short are never entered.
 
 	Parameters:
-		board (Board): The board object containing letters.
+		tree (Dawg): The word graph.
+		neighbors (Tuple[Tuple[int, ...], ...]): The adjacent positions of each position on the board.
+		chars (List[str]): The letter at each position.
+		codes (List[int]): The letter code at each position, or -1 if it is not a letter.
 		word (str): The current word being formed.
-		current_letter (Letter): The current letter being visited.
 		positions (List[int]): The list of positions of letters in the current word.
-		current_node (WordsTreeNode): The current node in the words tree.
-		min_length (Optional[int]): The minimum length of words to consider.
+		visited (int): Bitmask of the positions in the current word.
+		current_node (int): The current node in the word graph.
+		min_length (int): The minimum length of words to consider.
+		solutions (List[WordHuntSolution]): Found solutions are appended here.
 	"""
-	if current_node is None:
-		return []
+	if current_node == NO_NODE:
+		return
 	
-	solutions = []
-	if current_node.isEndOfWord() and (min_length is None or len(positions) >= min_length):
+	length = len(positions)
+	if tree.is_end_of_word(current_node) and length >= min_length:
 		solutions.append(WordHuntSolution(word, positions.copy()))
 
-	for dir in DIRECTIONS:
-		if board.tile_is_available(current_letter.pos, dir):
-			# if the letter in the specified direction exists and hasn't been visited
-			board_copy = board.copy_board()
-			neighbor_letter = board_copy.visit_direction(current_letter.pos, dir)
-			new_positions = positions.copy()
-			new_positions.append(neighbor_letter.pos)
-			solutions.extend(find_valid_from(
-				board_copy, 
-				word + neighbor_letter.char, 
-				neighbor_letter, 
-				new_positions, 
-				current_node.getChild(neighbor_letter.char), 
-				min_length
-			))
-	return solutions
+	for neighbor in neighbors[positions[-1]]:
+		if visited >> neighbor & 1 or codes[neighbor] == -1:
+			continue
+		child = tree.child(current_node, codes[neighbor])
+		if child == NO_NODE or length + 1 + tree.max_suffix_length[child] < min_length:
+			continue
+		positions.append(neighbor)
+		find_valid_from(
+			tree,
+			neighbors,
+			chars,
+			codes,
+			word + chars[neighbor], 
+			positions, 
+			visited | 1 << neighbor,
+			child, 
+			min_length,
+			solutions
+		)
+		positions.pop()
+
+
+def find_top_words(
+		shape: BoardShape,
+		letters: List[str],
+		tree: Dawg,
+		min_length: Optional[int],
+		limit: int,
+		start_positions: Optional[Sequence[int]] = None
+	) -> List[WordHuntSolution]:
+	"""
+	Find the highest scoring words on the board, skipping paths that cannot beat the words already found.
+
+	Parameters:
+		shape (BoardShape): The layout of the board.
+		letters (List[str]): The letter at each position of the board.
+		tree (Dawg): The word graph.
+		min_length (Optional[int]): The minimum length of words to consider.
+		limit (int): The number of words to find.
+		start_positions (Optional[Sequence[int]]): Only find words starting at these positions. Defaults to all of them.
+
+	Returns:
+		List[WordHuntSolution]: Up to `limit` distinct solutions, best first.
+	"""
+	neighbors = shape.neighbor_table
+	codes = [letter_code(letter) for letter in letters]
+	top = TopSolutions(limit)
+	for pos in range(len(letters)) if start_positions is None else start_positions:
+		if codes[pos] == -1:
+			continue
+		find_top_from(
+			tree,
+			neighbors,
+			letters,
+			codes,
+			letters[pos],
+			[pos],
+			1 << pos,
+			tree.child(ROOT, codes[pos]),
+			min_length or 0,
+			shape.num_cells,
+			top
+		)
+	return top.solutions()
+
+
+def find_top_from(
+		tree: Dawg,
+		neighbors: Tuple[Tuple[int, ...], ...],
+		chars: List[str],
+		codes: List[int],
+		word: str,
+		positions: List[int],
+		visited: int,
+		current_node: int,
+		min_length: int,
+		num_cells: int,
+		top: TopSolutions
+	) -> None:
+	"""
+	Like `find_valid_from`, but offers words to a bounded `TopSolutions` and prunes every branch whose
+	longest reachable word (limited by the word graph and by the unvisited cells) scores too low to enter it.
+
+	Parameters:
+		tree (Dawg): The word graph.
+		neighbors (Tuple[Tuple[int, ...], ...]): The adjacent positions of each position on the board.
+		chars (List[str]): The letter at each position.
+		codes (List[int]): The letter code at each position, or -1 if it is not a letter.
+		word (str): The current word being formed.
+		positions (List[int]): The list of positions of letters in the current word.
+		visited (int): Bitmask of the positions in the current word.
+		current_node (int): The current node in the word graph.
+		min_length (int): The minimum length of words to consider.
+		num_cells (int): The number of cells on the board.
+		top (TopSolutions): The best solutions found so far.
+	"""
+	if current_node == NO_NODE:
+		return
+	length = len(positions)
+	if length + min(tree.max_suffix_length[current_node], num_cells - length) < top.min_length_to_enter:
+		return
+
+	if tree.is_end_of_word(current_node) and length >= min_length and length >= top.min_length_to_enter:
+		top.add(word, positions)
+
+	# follow the branches that can reach the longest words first, so the top K fills with long words early
+	# and the threshold rises before the bulk of the search
+	branches = []
+	for neighbor in neighbors[positions[-1]]:
+		if visited >> neighbor & 1 or codes[neighbor] == -1:
+			continue
+		child = tree.child(current_node, codes[neighbor])
+		if child != NO_NODE:
+			branches.append((tree.max_suffix_length[child], neighbor, child))
+	branches.sort(reverse=True)
+	for _, neighbor, child in branches:
+		positions.append(neighbor)
+		find_top_from(
+			tree,
+			neighbors,
+			chars,
+			codes,
+			word + chars[neighbor],
+			positions,
+			visited | 1 << neighbor,
+			child,
+			min_length,
+			num_cells,
+			top
+		)
+		positions.pop()
 
 
 def transform_to_dict(solutions: List[WordHuntSolution]) -> Dict[str, List[int]]:
@@ -156,41 +323,199 @@ def transform_to_dict(solutions: List[WordHuntSolution]) -> Dict[str, List[int]]
 	return {solution.word: solution.positions for solution in solutions}
 
 
-def get_board_class(board_type: str):
+# Solutions keyed by the canonical orientation of a board, with positions in that orientation
+_solution_cache: LRUCache = LRUCache(SOLUTION_CACHE_SIZE)
+
+
+def canonicalize(shape: BoardShape, letters: List[str]) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
 	"""
-	Get the board class based on the board type string.
+	Picks one orientation to represent a board and all its rotations and reflections.
 
 	Parameters:
-		board_type (str): The type of the board (e.g., "4x4", "5x5", "cross", "donut").
-	
+		shape (BoardShape): The layout of the board.
+		letters (List[str]): The letter at each position of the board.
+
 	Returns:
-		Board: The corresponding board class.
-	Raises:
-		BackendError: If the board type is invalid.
+		Tuple[Tuple[str, ...], Tuple[int, ...]]: The letters of the canonical orientation (the smallest
+			of all the orientations), and the symmetry that maps the given board onto it.
 	"""
-	for cls in ALL_BOARD_CLASSES:
-		if cls.name == board_type:
-			return cls
-		
-	raise BackendError(ValueError(f"Invalid board type: {board_type}"))
+	best_letters, best_symmetry = None, None
+	for symmetry in shape.symmetries:
+		transformed = [''] * len(letters)
+		for position, letter in enumerate(letters):
+			transformed[symmetry[position]] = letter
+		transformed = tuple(transformed)
+		if best_letters is None or transformed < best_letters:
+			best_letters, best_symmetry = transformed, symmetry
+	return best_letters, best_symmetry
+
+
+def remap_positions(solutions: Dict[str, List[int]], mapping: List[int]) -> Dict[str, List[int]]:
+	"""
+	Parameters:
+		solutions (Dict[str, List[int]]): Words and their positions.
+		mapping (List[int]): The new position of each position.
+
+	Returns:
+		Dict[str, List[int]]: The same words in the same order, with remapped positions.
+	"""
+	return {word: [mapping[position] for position in positions] for word, positions in solutions.items()}
+
+
+def get_cache_stats() -> CacheStats:
+	return _solution_cache.stats()
+
+
+def clear_cache() -> None:
+	_solution_cache.clear()
+
+
+def search_starts(
+		shape: BoardShape,
+		letters: List[str],
+		min_length: int,
+		limit: Optional[int],
+		start_positions: Optional[Sequence[int]] = None
+	) -> List[WordHuntSolution]:
+	"""
+	Search the words starting at some positions, in the current process. This is also the unit of work
+	of the parallel search, so it only takes picklable arguments.
+
+	Parameters:
+		shape (BoardShape): The layout of the board.
+		letters (List[str]): The letter at each position of the board.
+		min_length (int): The minimum length of words to consider.
+		limit (Optional[int]): If given, only find this many of the highest scoring words.
+		start_positions (Optional[Sequence[int]]): The positions to start from. Defaults to all of them.
+
+	Returns:
+		List[WordHuntSolution]: The solutions found, not yet deduplicated or sorted.
+	"""
+	if limit is None:
+		return find_valid_words(shape, letters, get_words_tree(), min_length, start_positions)
+	return find_top_words(shape, letters, get_words_tree(), min_length, limit, start_positions)
+
+
+def search_in_parallel(
+		pool: Executor,
+		num_chunks: int,
+		shape: BoardShape,
+		letters: List[str],
+		min_length: int,
+		limit: Optional[int]
+	) -> List[WordHuntSolution]:
+	"""
+	Split the starting positions into chunks and search each chunk in a worker.
+
+	Parameters:
+		pool (Executor): The worker pool. Its workers must have the dictionary loaded.
+		num_chunks (int): The number of chunks to split the starting positions into.
+		shape (BoardShape): The layout of the board.
+		letters (List[str]): The letter at each position of the board.
+		min_length (int): The minimum length of words to consider.
+		limit (Optional[int]): If given, each chunk only finds this many of its highest scoring words,
+			which always include its share of the overall best.
+
+	Returns:
+		List[WordHuntSolution]: The solutions of every chunk, in the order a single process would find them.
+	"""
+	starts = [pos for pos, letter in enumerate(letters) if letter_code(letter) != -1]
+	# interleaved, since neighboring cells tend to have a similar amount of work
+	futures = [
+		pool.submit(search_starts, shape, letters, min_length, limit, starts[chunk::num_chunks])
+		for chunk in range(num_chunks)
+	]
+	solutions = [solution for future in futures for solution in future.result()]
+	solutions.sort(key=lambda solution: solution.positions[0])
+	return solutions
+
+
+def rank_solutions(solutions: List[WordHuntSolution], limit: Optional[int]) -> Dict[str, List[int]]:
+	"""
+	Deduplicate and sort solutions, best first.
+
+	Parameters:
+		solutions (List[WordHuntSolution]): The solutions found.
+		limit (Optional[int]): If given, only keep this many of the highest scoring words.
+	"""
+	if limit is not None:
+		top = TopSolutions(limit)
+		for solution in solutions:
+			top.add(solution.word, solution.positions)
+		return transform_to_dict(top.solutions())
+	deduped_solutions = list({s.word: s for s in solutions}.values())
+	valid_words_sorted = sorted(deduped_solutions, key=cmp_to_key(word_compare))
+	return transform_to_dict(valid_words_sorted)
+
+
+def solve(
+		shape: BoardShape,
+		letters: List[str],
+		min_length: int,
+		limit: Optional[int],
+		parallel: bool = False
+	) -> Dict[str, List[int]]:
+	"""
+	Solve a board without the cache.
+
+	Parameters:
+		shape (BoardShape): The layout of the board.
+		letters (List[str]): The letter at each position of the board.
+		min_length (int): The minimum length of words to consider.
+		limit (Optional[int]): If given, only return this many of the highest scoring words.
+		parallel (bool): Whether to split the search across the worker pool, if it is running.
+	"""
+	pool = get_worker_pool() if parallel else None
+	solutions = None
+	if pool is not None:
+		try:
+			solutions = search_in_parallel(pool, WORKER_POOL_SIZE, shape, letters, min_length, limit)
+		except BrokenProcessPool:
+			discard_worker_pool(pool)  # and search in process below
+	if solutions is None:
+		solutions = search_starts(shape, letters, min_length, limit)
+	return rank_solutions(solutions, limit)
 
 
 def run(
 		letters: List[str], 
 		board_type: str, 
-		min_length: int = DEFAULT_MIN_LENGTH
+		min_length: int = DEFAULT_MIN_LENGTH,
+		board_mask: Optional[List[str]] = None,
+		limit: Optional[int] = None,
+		parallel: bool = False
 	) -> Dict[str, List[int]]:
 	"""
-	Run the Word Hunt solver with a given list of letters and board class.
+	Run the Word Hunt solver with a given list of letters and board type.
+	Results are cached, and a board that is a rotation or reflection of a cached one is answered
+	from the cache with its positions remapped.
 	
 	Parameters:
 		letters (List[str]): List of letters to populate the board.
-		board_type (str): The class of the board to use (e.g., "SmallSquareBoard").
+		board_type (str): The type of board to use (e.g., "4x4", "cross", "8x8").
 		min_length (int): The minimum length of words to consider.
+		board_mask (Optional[List[str]]): A custom board layout, see `get_board_shape`.
+		limit (Optional[int]): If given, only return this many of the highest scoring words.
+		parallel (bool): Whether to split the search across the worker pool (see utils.worker_pool).
+			Worth it for large boards; small boards solve faster than the round trip to the workers.
+			Until the pool is up the search runs in process.
 	"""
-	letter_objs = [Letter(letter, i) for i, letter in enumerate(letters)]
-	board = get_board_class(board_type)(letter_objs)
-	solutions = find_valid_words(board, get_words_tree(), min_length)
-	deduped_solutions = list({s.word: s for s in solutions}.values())
-	valid_words_sorted = sorted(deduped_solutions, key=cmp_to_key(word_compare))
-	return transform_to_dict(valid_words_sorted)
+	shape = get_board_shape(board_type, board_mask)
+	if len(letters) != shape.num_cells:
+		raise BackendError(ValueError(f"Board {shape.name} needs {shape.num_cells} letters, got {len(letters)}."))
+	if limit is not None and limit < 1:
+		raise BackendError(ValueError("The word limit must be at least 1."))
+
+	canonical_letters, symmetry = canonicalize(shape, letters)
+	# the cell mask rather than the board name, so equal layouts share entries
+	key = (shape.cell_mask, canonical_letters, min_length, limit)
+	canonical_solutions = _solution_cache.get(key)
+	if canonical_solutions is None:
+		solutions = solve(shape, letters, min_length, limit, parallel)
+		_solution_cache.put(key, remap_positions(solutions, symmetry))
+		return solutions
+
+	to_caller = [0] * len(symmetry)
+	for position, canonical_position in enumerate(symmetry):
+		to_caller[canonical_position] = position
+	return remap_positions(canonical_solutions, to_caller)
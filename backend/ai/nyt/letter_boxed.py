@@ -1,37 +1,88 @@
-from typing import Set, List, Dict, Optional
-from utils.data_store import get_common_word_set
+import heapq
+import numpy as np
+from dataclasses import dataclass
+from typing import Set, List, Dict, Iterable, Optional, Tuple
+from utils.data_store import get_words_tree
+from utils.error import BackendError
+from utils.word_games.dawg import Dawg, ALPHABET_SIZE, NO_NODE, ROOT, letter_code
+from utils.word_games.word_index import letters_mask
 
 DEFAULT_MAX_WORDS_IN_SOLUTION = 5
+MIN_WORD_LENGTH = 3
+
+def find_suffixes(
+        current_node: int,
+        last_code: int,
+        next_letters: List[List[Tuple[int, str]]],
+        next_masks: List[int],
+        tree: Dawg,
+        memo: Dict[Tuple[int, int], List[str]]
+    ) -> List[str]:
+    """
+    Finds all the ways to finish a word from the current node, following the side rule. Only letters on a
+    different side from the last letter are walked, so branches that break the rule are never expanded.
+    Results are memoized on (node, last letter), since prefixes that share a suffix node share their suffixes.
+
+    Parameters:
+        current_node (int): The current node in the word graph.
+        last_code (int): The letter code of the last letter of the prefix.
+        next_letters (List[List[Tuple[int, str]]]): The (code, letter) pairs that may follow each letter code.
+        next_masks (List[int]): The letter mask of `next_letters` for each letter code.
+        tree (Dawg): The word graph.
+        memo (Dict[Tuple[int, int], List[str]]): Suffixes already found, keyed by (node, last letter code).
+
+    Returns:
+        List[str]: The suffixes, alphabetically, including "" if the prefix is a word.
+    """
+    key = (current_node, last_code)
+    cached = memo.get(key)
+    if cached is not None:
+        return cached
+    suffixes = [""] if tree.end_of_word[current_node] else []
+    for code, letter in next_letters[last_code]:
+        next_node = tree.children[current_node * ALPHABET_SIZE + code]
+        if next_node == NO_NODE:
+            continue
+        # a child that does not end a word needs at least one more letter, so skip it if none of its letters can follow
+        if not tree.end_of_word[next_node] and not tree.suffix_letter_masks[next_node] & next_masks[code]:
+            continue
+        for suffix in find_suffixes(next_node, code, next_letters, next_masks, tree, memo):
+            suffixes.append(letter + suffix)
+    memo[key] = suffixes
+    return suffixes
+
 
 def get_valid_words(letter_dict: Dict[str, Set[str]]) -> List[str]:
     """
-    Get potential words that can be formed with the given letters.
+    Get potential words that can be formed with the given letters, by walking the word graph along
+    letters that may follow each other.
     
     Parameters:
         letter_dict (Dict[str, Set[str]]): A dictionary mapping letters to sets of letters they can match with.
         
     Returns:
-        list[str]: A list of valid words that can be formed with the given letters.
+        list[str]: A list of valid words that can be formed with the given letters, alphabetically.
     """
+    tree = get_words_tree()
+    # letters that are not single lowercase letters cannot be part of any word
+    letters = sorted(letter for letter in letter_dict if letter_code(letter) != -1)
+    next_letters: List[List[Tuple[int, str]]] = [[] for _ in range(ALPHABET_SIZE)]
+    next_masks = [0] * ALPHABET_SIZE
+    for letter in letters:
+        followers = sorted(follower for follower in letter_dict[letter] if letter_code(follower) != -1)
+        next_letters[letter_code(letter)] = [(letter_code(follower), follower) for follower in followers]
+        next_masks[letter_code(letter)] = letters_mask(followers)
+
     words = []
-    all_letters = letter_dict.keys()
-    for word in get_common_word_set():
-        if len(word) < 3 or any(letter not in all_letters for letter in word):
-            continue
-        has_consecutive_duplicates = any(word[i] == word[i + 1] for i in range(len(word) - 1))
-        if has_consecutive_duplicates:
+    memo: Dict[Tuple[int, int], List[str]] = {}
+    for letter in letters:
+        code = letter_code(letter)
+        node = tree.children[ROOT * ALPHABET_SIZE + code]
+        if node == NO_NODE:
             continue
-        valid = True
-        for i, letter in enumerate(word):
-            if i == len(word) - 1:
-                valid = True
-                break
-            next_letter = word[i + 1]
-            if next_letter not in letter_dict.get(letter, set()):
-                valid = False
-                break
-        if valid:
-            words.append(word)
+        for suffix in find_suffixes(node, code, next_letters, next_masks, tree, memo):
+            if len(suffix) + 1 >= MIN_WORD_LENGTH:
+                words.append(letter + suffix)
     return words
 
 
@@ -56,117 +107,404 @@ def build_letter_dict(letter_sides: List[Set[str]]) -> dict:
     return letter_dict
 
 
-def get_valid_next_words(potential_words: List[str], unused_letters: Set[str]) -> List[str]:
+@dataclass
+class WordClass:
     """
-    Get valid next words that can be formed with the next letter and unused letters.
-    
+    Words that are interchangeable in a solution: same first letter, same last letter and same set of letters.
+
+    Attributes:
+        first (str): The first letter of the words.
+        last (str): The last letter of the words.
+        mask (int): The letter mask of the words.
+        words (List[str]): The words, shortest first, then alphabetically.
+    """
+    first: str
+    last: str
+    mask: int
+    words: List[str]
+
+
+def build_word_classes(words: List[str]) -> List[WordClass]:
+    """
+    Groups words into classes by (first letter, last letter, letter mask).
+
     Parameters:
-        potential_words (List[str]): A list of all potentially valid words.
-        unused_letters (Set[str]): A set of letters that have not been used yet.
-        
+        words (List[str]): The valid words.
+
     Returns:
-        list[str]: A list of valid next words that can be formed.
+        List[WordClass]: The classes, in order of their shortest word.
     """
-    valid_next_words = []
-    for word in potential_words:
-        # only consider words that start with the next letter and contain at least one unused letter
-        if any(letter in unused_letters for letter in word):
-            valid_next_words.append(word)
-    return valid_next_words
+    classes: Dict[Tuple[str, str, int], WordClass] = {}
+    for word in sorted(words, key=lambda word: (len(word), word)):
+        key = (word[0], word[-1], letters_mask(word))
+        if key not in classes:
+            classes[key] = WordClass(first=word[0], last=word[-1], mask=key[2], words=[])
+        classes[key].words.append(word)
+    return list(classes.values())
 
 
-def solve_words(
-        words_found: List[str], 
-        unused_letters: Set[str], 
-        letters_to_words: Dict[str, List[str]],
-        max_solutions_length: int = DEFAULT_MAX_WORDS_IN_SOLUTION
-    ) -> Optional[List[str]]:
+def pair_with_classes(
+        last_codes: np.ndarray,
+        sorted_firsts: np.ndarray,
+        by_first: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Recursive. Find the best valid word list that includes all words in words_found.
-    
+    Pairs each state with every word class starting with the state's last letter.
+
     Parameters:
-        words_found (List[str]): A list of words that have been found so far.
-        unused_letters (Set[str]): A set of letters that have not been used yet.
-        letters_to_words (Dict[str, List[str]]): A dictionary where keys are letters and values are lists of words starting with that letter.
-        max_solutions_length (int): The maximum number of words allowed in the solution.
-        
+        last_codes (np.ndarray): int64, the last letter code of each state.
+        sorted_firsts (np.ndarray): int64, the first letter code of each class, sorted.
+        by_first (np.ndarray): int64, the class ids in the order of `sorted_firsts`.
+
     Returns:
-        list[str]: A list of valid words that can be formed with the given letters, or None if no valid combination is found.
+        Tuple[np.ndarray, np.ndarray]: The index of the state and the id of the class of each pair,
+            grouped by state in order.
     """
-    if len(words_found) >= max_solutions_length:
-        # If we have already used the maximum number of words, there's no point in searching further
-        return None
-    
-    next_letter = words_found[-1][-1]
-    valid_next_words = get_valid_next_words(letters_to_words[next_letter], unused_letters)
+    starts = np.searchsorted(sorted_firsts, last_codes, side='left')
+    counts = np.searchsorted(sorted_firsts, last_codes, side='right') - starts
+    state_ids = np.repeat(np.arange(len(last_codes)), counts)
+    offsets = np.arange(len(state_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return state_ids, by_first[np.repeat(starts, counts) + offsets]
 
-    
-    if not valid_next_words:
-        return None
-    
-    best_solution_length = max_solutions_length + 1
-    best_solution = None
-    for word in valid_next_words:
-        new_unused_letters = unused_letters - set(word)
-        new_words_found = words_found + [word]
-
-        if not new_unused_letters:
-            # If no unused letters left, we have a valid solution
-            return new_words_found
-        
-        result = solve_words(new_words_found, new_unused_letters, letters_to_words, best_solution_length - 1)
-        if result is not None and len(result) < best_solution_length:
-            best_solution_length = len(result)
-            best_solution = result
-    
-    return best_solution
 
+# A search state packs the last letter of a chain and the letters the chain has covered into one integer,
+# `covered << STATE_LETTER_BITS | last letter code`, where bit i of `covered` stands for the i-th puzzle letter.
+# States are numbered densely, so values per state are kept in arrays indexed by state.
+STATE_LETTER_BITS = 5  # letter codes are below 32
+LAST_LETTER_MASK = (1 << STATE_LETTER_BITS) - 1
+MAX_PUZZLE_LETTERS = 16
+
+# A completion cost packs the number of words, the number of letters and the first word class of the best way
+# to cover the rest of the letters from a state into one integer, so that comparing costs ranks them
+COST_WORDS_SHIFT = 40
+COST_LETTERS_SHIFT = 20
+COST_LETTERS_MASK = (1 << (COST_WORDS_SHIFT - COST_LETTERS_SHIFT)) - 1
+COST_CLASS_MASK = (1 << COST_LETTERS_SHIFT) - 1
+NO_COMPLETION = np.iinfo(np.int64).max
+
+# stands for the state before the first word in `best_chains`
+START_STATE = -1
 
-def solve(all_words: List[str], letters_to_words: Dict[str, List[str]], all_letters: Set[str], max_solutions_length: int = DEFAULT_MAX_WORDS_IN_SOLUTION) -> List[List[str]]:
+
+def split_cost(cost: int) -> Tuple[int, int, int]:
+    """The number of words, the number of letters and the first class of a completion cost"""
+    return cost >> COST_WORDS_SHIFT, (cost >> COST_LETTERS_SHIFT) & COST_LETTERS_MASK, cost & COST_CLASS_MASK
+
+
+@dataclass
+class StateSpace:
+    """
+    The word classes of a puzzle, as arrays for stepping between dense states.
+
+    Attributes:
+        letter_bits (Dict[str, int]): The bit of each puzzle letter in a covered mask.
+        all_covered (int): The covered mask of every puzzle letter.
+        class_covered (np.ndarray): int64, the covered mask of each class.
+        class_firsts (np.ndarray): int64, the first letter code of each class.
+        class_lasts (np.ndarray): int64, the last letter code of each class.
+        class_steps (np.ndarray): int64, the completion cost of one word of each class.
+        sorted_firsts (np.ndarray): int64, `class_firsts`, sorted.
+        by_first (np.ndarray): int64, the class ids in the order of `sorted_firsts`.
+    """
+    letter_bits: Dict[str, int]
+    all_covered: int
+    class_covered: np.ndarray
+    class_firsts: np.ndarray
+    class_lasts: np.ndarray
+    class_steps: np.ndarray
+    sorted_firsts: np.ndarray
+    by_first: np.ndarray
+
+    @property
+    def num_states(self) -> int:
+        return (self.all_covered + 1) << STATE_LETTER_BITS
+
+    def covered_mask(self, letters: Iterable[str]) -> int:
+        return sum(1 << self.letter_bits[letter] for letter in set(letters))
+
+    def word_state(self, word: str) -> int:
+        """The state of a chain ending with a word"""
+        return (self.covered_mask(word) << STATE_LETTER_BITS) | letter_code(word[-1])
+
+
+def build_state_space(classes: List[WordClass], all_letters: Set[str]) -> StateSpace:
     """
-    Solve the Letter Boxed puzzle by finding all valid combinations of words.
-    
     Parameters:
-        all_words (List[str]): A list of all potentially valid words that can be formed with the letters.
-        letters_to_words (Dict[str, List[str]]): A dictionary where keys are letters and values are lists of words starting with that letter.
-        all_letters (Set[str]): A set of letters that can be used to form words.
-        max_solutions_length (int): The maximum number of words allowed in the solution.
-        
+        classes (List[WordClass]): The word classes.
+        all_letters (Set[str]): The puzzle's letters, at most MAX_PUZZLE_LETTERS of them.
+
     Returns:
-        list[list[str]]: A list of valid word combinations that use all letters.
+        StateSpace: The class arrays.
     """
-    solutions = []
-    for word in all_words:
-        words_found = [word]
-        unused_letters = all_letters - set(word)
-        solution = solve_words(words_found, unused_letters, letters_to_words, max_solutions_length)
-        if solution is not None:
-            solutions.append(solution)
+    letter_bits = {letter: bit for bit, letter in enumerate(sorted(all_letters))}
+    class_firsts = np.array([letter_code(word_class.first) for word_class in classes], dtype=np.int64)
+    lengths = np.array([len(word_class.words[0]) for word_class in classes], dtype=np.int64)
+    by_first = np.argsort(class_firsts, kind='stable')
+    return StateSpace(
+        letter_bits=letter_bits,
+        all_covered=(1 << len(letter_bits)) - 1,
+        class_covered=np.array([sum(1 << letter_bits[letter] for letter in set(word_class.words[0])) for word_class in classes], dtype=np.int64),
+        class_firsts=class_firsts,
+        class_lasts=np.array([letter_code(word_class.last) for word_class in classes], dtype=np.int64),
+        class_steps=(1 << COST_WORDS_SHIFT) + (lengths << COST_LETTERS_SHIFT) + np.arange(len(classes), dtype=np.int64),
+        sorted_firsts=class_firsts[by_first],
+        by_first=by_first,
+    )
 
-    return sorted(solutions, key=lambda x: (len(x), sum(len(word) for word in x)))
 
+def reachable_states(space: StateSpace, max_solutions_length: int) -> np.ndarray:
+    """
+    Finds the states some chain of at most `max_solutions_length` words reaches, breadth first by word count,
+    expanding each state once. Solved states are not expanded, and each word after the first must cover a
+    new letter.
+
+    Parameters:
+        space (StateSpace): The puzzle's classes.
+        max_solutions_length (int): The maximum number of words allowed in a solution.
 
-def run(letter_sides: List[Set[str]], max_solutions_length: int = DEFAULT_MAX_WORDS_IN_SOLUTION) -> List[List[str]]:
+    Returns:
+        np.ndarray: int64, the reachable states, sorted.
+    """
+    reached = np.zeros(space.num_states, dtype=bool)
+    layer = np.unique((space.class_covered << STATE_LETTER_BITS) | space.class_lasts)
+    reached[layer] = True
+    for _ in range(1, max_solutions_length):
+        layer = layer[(layer >> STATE_LETTER_BITS) != space.all_covered]
+        if len(layer) == 0:
+            break
+        state_ids, class_ids = pair_with_classes(layer & LAST_LETTER_MASK, space.sorted_firsts, space.by_first)
+        covered = layer[state_ids] >> STATE_LETTER_BITS
+        next_covered = covered | space.class_covered[class_ids]
+        next_states = (next_covered << STATE_LETTER_BITS) | space.class_lasts[class_ids]
+        layer = np.unique(next_states[(next_covered != covered) & ~reached[next_states]])
+        reached[layer] = True
+    return np.flatnonzero(reached)
+
+
+def completion_costs(space: StateSpace, states: np.ndarray) -> np.ndarray:
+    """
+    Finds the best way to cover the rest of the letters from every reachable state: fewest words, then fewest
+    letters, using the shortest word of each class. Every word covers a new letter, so states are worked
+    through from the most covered letters to the fewest, each group with array operations over all its
+    (state, word class) pairs.
+
+    Parameters:
+        space (StateSpace): The puzzle's classes.
+        states (np.ndarray): int64, the reachable states, see `reachable_states`. Chains through any other
+            state are too long, so they are not considered.
+
+    Returns:
+        np.ndarray: int64, the cost of each state (see COST_WORDS_SHIFT), indexed by state: 0 for a solved
+            state, NO_COMPLETION if it cannot be solved or is not reachable.
+    """
+    costs = np.full(space.num_states, NO_COMPLETION, dtype=np.int64)
+    covered = states >> STATE_LETTER_BITS
+    num_covered = sum((covered >> bit) & 1 for bit in range(len(space.letter_bits)))
+    solved = covered == space.all_covered
+    costs[states[solved]] = 0
+    for count in np.unique(num_covered[~solved])[::-1]:
+        group = states[(num_covered == count) & ~solved]
+        state_ids, class_ids = pair_with_classes(group & LAST_LETTER_MASK, space.sorted_firsts, space.by_first)
+        group_covered = group[state_ids] >> STATE_LETTER_BITS
+        next_covered = group_covered | space.class_covered[class_ids]
+        next_costs = costs[(next_covered << STATE_LETTER_BITS) | space.class_lasts[class_ids]]
+        keep = (next_covered != group_covered) & (next_costs != NO_COMPLETION)
+        if not keep.any():
+            continue
+        state_ids = state_ids[keep]
+        # the next state's cost without its first class, plus this word
+        candidates = (next_costs[keep] & ~COST_CLASS_MASK) + space.class_steps[class_ids[keep]]
+        # pairs are grouped by state, so each state's best is the minimum of its run
+        starts = np.flatnonzero(np.concatenate(([True], state_ids[1:] != state_ids[:-1])))
+        costs[group[state_ids[starts]]] = np.minimum.reduceat(candidates, starts)
+    return costs
+
+
+def best_chain_per_word(
+        words: List[str],
+        classes: List[WordClass],
+        space: StateSpace,
+        costs: np.ndarray,
+        max_solutions_length: int
+    ) -> List[List[str]]:
+    """
+    Finds the best chain starting with each word: fewest words, then fewest letters, using the shortest word
+    of each class after the first.
+
+    Parameters:
+        words (List[str]): The valid words.
+        classes (List[WordClass]): The word classes.
+        space (StateSpace): The puzzle's classes.
+        costs (np.ndarray): int64, the completion cost of each state, see `completion_costs`.
+        max_solutions_length (int): The maximum number of words allowed in a solution.
+
+    Returns:
+        List[List[str]]: The chain of each word that starts one within the word limit, ranked by word count,
+            then total letters, then alphabetically.
+    """
+    chains = []
+    for word in words:
+        state = space.word_state(word)
+        cost = int(costs[state])
+        if cost == NO_COMPLETION or 1 + split_cost(cost)[0] > max_solutions_length:
+            continue
+        chain = [word]
+        while cost:
+            class_id = split_cost(cost)[2]
+            chain.append(classes[class_id].words[0])
+            covered = (state >> STATE_LETTER_BITS) | int(space.class_covered[class_id])
+            state = (covered << STATE_LETTER_BITS) | int(space.class_lasts[class_id])
+            cost = int(costs[state])
+        chains.append(chain)
+    chains.sort(key=lambda chain: (len(chain), sum(len(word) for word in chain), chain))
+    return chains
+
+
+def best_chains(
+        classes: List[WordClass],
+        space: StateSpace,
+        costs: np.ndarray,
+        max_solutions_length: int,
+        limit: int
+    ) -> List[List[str]]:
+    """
+    Finds the best `limit` chains, fewest words, then fewest letters, using the shortest word of each class.
+
+    A best-first search over partial chains, ranked by their words and letters so far plus the completion
+    cost of their state. That cost is exact, so complete chains come out best first, and the search stops
+    once it has `limit` of them and nothing left can tie the last. A partial chain tries the words that can
+    follow it one at a time, best first, so each step queues at most two entries rather than every word that
+    can follow, and any entry that cannot beat the `limit`th best chain is never taken off the queue.
+
+    Parameters:
+        classes (List[WordClass]): The word classes.
+        space (StateSpace): The puzzle's classes.
+        costs (np.ndarray): int64, the completion cost of each state, see `completion_costs`.
+        max_solutions_length (int): The maximum number of words allowed in a solution.
+        limit (int): The number of chains to find.
+
+    Returns:
+        List[List[str]]: The chains, ranked by word count, then total letters, then alphabetically.
+    """
+    lengths = [len(word_class.words[0]) for word_class in classes]
+
+    def option(class_id: int, next_state: int) -> Optional[Tuple[int, int, int, int]]:
+        """The (words, letters) to finish a chain through a class and the state it reaches, or None if it cannot be"""
+        cost = int(costs[next_state])
+        if cost == NO_COMPLETION:
+            return None
+        words, letters, _ = split_cost(cost)
+        return 1 + words, lengths[class_id] + letters, class_id, next_state
+
+    # the words that can follow each state, best first, found when first needed; any word can start a chain
+    followers: Dict[int, List[Tuple[int, int, int, int]]] = {
+        START_STATE: sorted(filter(None, (
+            option(class_id, space.word_state(word_class.words[0])) for class_id, word_class in enumerate(classes)
+        )))
+    }
+
+    def next_words(state: int) -> List[Tuple[int, int, int, int]]:
+        if state not in followers:
+            covered = state >> STATE_LETTER_BITS
+            last_code = state & LAST_LETTER_MASK
+            start = np.searchsorted(space.sorted_firsts, last_code, side='left')
+            end = np.searchsorted(space.sorted_firsts, last_code, side='right')
+            options = []
+            for class_id in space.by_first[start:end].tolist():
+                class_covered = int(space.class_covered[class_id])
+                if class_covered & ~covered:  # every word after the first must cover a new letter
+                    next_covered = covered | class_covered
+                    options.append(option(class_id, (next_covered << STATE_LETTER_BITS) | int(space.class_lasts[class_id])))
+            followers[state] = sorted(filter(None, options))
+        return followers[state]
+
+    def entry(prefix: List[str], words: int, letters: int, state: int, index: int) -> Optional[tuple]:
+        """The queue entry of a partial chain extended with the `index`th best word that can follow it, if it fits"""
+        options = next_words(state)
+        if index == len(options) or words + options[index][0] > max_solutions_length:
+            return None  # options are sorted by words first, so no later one fits either
+        finish_words, finish_letters, class_id, _ = options[index]
+        chain = prefix + [classes[class_id].words[0]]
+        return words + finish_words, letters + finish_letters, chain, words, letters, state, index
+
+    queue = [queued for queued in [entry([], 0, 0, START_STATE, 0)] if queued is not None]
+    best: List[Tuple[int, int, List[str]]] = []
+    while queue:
+        total_words, total_letters, chain, words, letters, state, index = heapq.heappop(queue)
+        if len(best) >= limit and (total_words, total_letters) > best[limit - 1][:2]:
+            break  # every chain left is worse than the `limit`th best
+        next_state = followers[state][index][3]
+        sibling = entry(chain[:-1], words, letters, state, index + 1)
+        if sibling is not None:
+            heapq.heappush(queue, sibling)
+        if costs[next_state] == 0:
+            best.append((total_words, total_letters, chain))
+            continue
+        child = entry(chain, words + 1, letters + len(chain[-1]), next_state, 0)
+        if child is not None:
+            heapq.heappush(queue, child)
+    best.sort()
+    return [chain for _, _, chain in best[:limit]]
+
+
+def solve(
+        words: List[str],
+        all_letters: Set[str],
+        max_solutions_length: int = DEFAULT_MAX_WORDS_IN_SOLUTION,
+        max_results: Optional[int] = None
+    ) -> List[List[str]]:
+    """
+    Solve the Letter Boxed puzzle, ranking solutions by word count, then by total letters.
+
+    Without `max_results`, the best chain starting with each word is returned, so there is one solution per
+    word as the frontend expects, using the shortest word of each class of interchangeable words after the
+    first. With it, the best `max_results` chains are returned, using the shortest word of each class, taking
+    chains with more words only when there are not enough with fewer; the search stops as soon as it has them,
+    and chains that cannot make the cut are pruned rather than listed. Chains that reach the same letters as
+    a shorter one are still found:
+
+    >>> solve(['abcd', 'abc', 'cd', 'ab', 'bc'], set('abcd'), 3, 10)
+    [['abcd'], ['abc', 'cd'], ['ab', 'bc', 'cd']]
+
+    Parameters:
+        words (List[str]): A list of all potentially valid words that can be formed with the letters.
+        all_letters (Set[str]): A set of letters that can be used to form words, at most MAX_PUZZLE_LETTERS.
+        max_solutions_length (int): The maximum number of words allowed in the solution.
+        max_results (Optional[int]): The maximum number of solutions to return, or None for the best one per word.
+
+    Returns:
+        list[list[str]]: The ranked solutions, or an empty list if the puzzle cannot be solved with at most
+            `max_solutions_length` words.
+    """
+    classes = build_word_classes(words)
+    if not classes or max_solutions_length < 1 or (max_results is not None and max_results < 1):
+        return []
+    space = build_state_space(classes, all_letters)
+    costs = completion_costs(space, reachable_states(space, max_solutions_length))
+    if max_results is None:
+        return best_chain_per_word(words, classes, space, costs, max_solutions_length)
+    return best_chains(classes, space, costs, max_solutions_length, max_results)
+
+
+def run(
+        letter_sides: List[Set[str]],
+        max_solutions_length: int = DEFAULT_MAX_WORDS_IN_SOLUTION,
+        max_results: Optional[int] = None
+    ) -> List[List[str]]:
     """
     Run the Letter Boxed game with the provided input.
     
     Parameters:
         letter_sides (List[Set[str]]): A list of sets of letters from each side of the box
-        only_length_two (bool): If True, only consider solutions of length 2.
+        max_solutions_length (int): The maximum number of words allowed in a solution.
+        max_results (Optional[int]): The maximum number of solutions to return, or None for the best one per word.
     Returns:
         list[list[str]]: A list of valid word combinations to finish the puzzle
+    Raises:
+        BackendError: If the puzzle has more than MAX_PUZZLE_LETTERS letters.
     """
     all_letters = {letter for letter in set.union(*letter_sides)}
+    if len(all_letters) > MAX_PUZZLE_LETTERS:
+        raise BackendError(ValueError(f"Letter Boxed puzzles can have at most {MAX_PUZZLE_LETTERS} letters."))
     letter_dict = build_letter_dict(letter_sides)
-    # Sorts words by number of unique letters, and then by length (shorter is better)
-    words_from_given_letters = sorted(
-        get_valid_words(letter_dict),
-        key=lambda word: (len(set(word)), -len(word)),
-        reverse=True
-    )
-
-    letters_to_words = {letter: [] for letter in all_letters}
-    for word in words_from_given_letters:
-        letters_to_words[word[0]].append(word)
-
-    return solve(words_from_given_letters, letters_to_words, all_letters, max_solutions_length)
+    return solve(get_valid_words(letter_dict), all_letters, max_solutions_length, max_results)
@@ -1,5 +1,8 @@
+import numpy as np
 from typing import Set, List
-from utils.data_store import get_common_word_set
+from utils.data_store import get_word_index, get_spelling_bee_table
+from utils.word_games.spelling_bee_table import MAX_DISTINCT_LETTERS, MIN_WORD_LENGTH
+from utils.word_games.word_index import letters_mask
 
 def spelling_bee_sort(word: str, center_letter: str, outer_letters: Set[str]) -> int:
     """
@@ -25,6 +28,29 @@ def spelling_bee_sort(word: str, center_letter: str, outer_letters: Set[str]) ->
     return (1 if is_pangram else 0, len(word))
 
 
+def lookup_words(center_mask: int, outer_masks: List[int]) -> List[str]:
+    """
+    Find the valid words in the precomputed Spelling Bee table. Every valid word's distinct letters are the
+    center letter plus a subset of the outer letters, so this looks up the bucket of each of those subsets.
+
+    Parameters:
+        center_mask (int): The letter mask of the center letter.
+        outer_masks (List[int]): The letter mask of each distinct outer letter (at most 6).
+    Returns:
+        list[str]: The valid words, pangrams first, then by length, then alphabetically.
+    """
+    subset_masks = [center_mask]
+    for outer_mask in outer_masks:
+        subset_masks += [mask | outer_mask for mask in subset_masks]
+    index = get_word_index()
+    buckets = get_spelling_bee_table().lookup(subset_masks)
+    # the last subset uses every letter, so its bucket holds the pangrams, already sorted
+    pangram_ids = buckets[-1]
+    other_ids = np.concatenate([pangram_ids[:0]] + buckets[:-1])
+    other_ids = other_ids[np.lexsort((other_ids, -index.lengths[other_ids].astype(np.int32)))]
+    return [index.words[i] for i in np.concatenate((pangram_ids, other_ids)).tolist()]
+
+
 def run(center_letter: str, outer_letters: Set[str]) -> List[str]:
     """
     Run the Spelling Bee game with the provided input.
@@ -37,15 +63,22 @@ def run(center_letter: str, outer_letters: Set[str]) -> List[str]:
     """
     center_letter = center_letter.lower()
     outer_letters = {letter.lower() for letter in outer_letters}
-    valid_words = []
-    for word in get_common_word_set():
-        if len(word) < 4:
-            continue
-        if center_letter not in word:
-            continue
-        if any(letter not in outer_letters and letter != center_letter for letter in word):
-            continue
-        valid_words.append(word)
+    center_mask = letters_mask(center_letter)
+    if center_mask == 0:
+        return []
+    outer_masks = [mask for mask in {letters_mask(letter) for letter in outer_letters} if mask not in (0, center_mask)]
+    if len(outer_masks) < MAX_DISTINCT_LETTERS:
+        return lookup_words(center_mask, outer_masks)
+
+    # puzzles with more letters than the real game can have answers that are not in the table, so scan the index
+    index = get_word_index()
+    # words that contain the center letter, use only the puzzle's letters, and are long enough
+    matches = (
+        index.subset_of(center_mask | letters_mask(outer_letters))
+        & ((index.letter_masks & np.uint32(center_mask)) != 0)
+        & (index.lengths >= MIN_WORD_LENGTH)
+    )
+    valid_words = [index.words[i] for i in np.flatnonzero(matches)]
     valid_words.sort(key=lambda word: spelling_bee_sort(word, center_letter, outer_letters), reverse=True)
     return valid_words
 
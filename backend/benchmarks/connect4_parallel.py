@@ -0,0 +1,52 @@
+# Measures the parallel Connect 4 root search as the number of worker processes grows: nodes per second and
+# time to reach each depth, over random midgame positions.
+# Run from the /backend folder:
+#   python -m benchmarks.connect4_parallel --workers 1 2 4 8 --depths 6 7 8
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from ai.game_pigeon.connect4.connect4 import AI_PIECE
+from ai.game_pigeon.connect4.connect4_strategy import Connect4Strategy, initialize_search_worker
+from benchmarks.connect4_search import random_board
+from utils.worker_pool import POOL_CONTEXT, create_process_pool
+
+
+def measure(search_pool, depth: int, boards):
+	"""Returns the median search time in ms and the nodes per second over the boards, in process if `search_pool` is None."""
+	times, nodes = [], []
+	for board in boards:
+		ai = Connect4Strategy(AI_PIECE, search_pool=search_pool)
+		start = time.perf_counter()
+		ai.get_move(board, depth)
+		times.append(time.perf_counter() - start)
+		nodes.append(ai.nodes_searched)
+	return statistics.median(times) * 1000, sum(nodes) / sum(times)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+	parser.add_argument('--depths', type=int, nargs='+', default=[6, 7, 8])
+	parser.add_argument('--positions', type=int, default=10)
+	args = parser.parse_args()
+	rng = random.Random(0)
+	boards = [random_board(2 * rng.randint(0, 8), rng) for _ in range(args.positions)]
+
+	print(f"{os.cpu_count()} cores available")
+	print(f"{'depth':>5} {'workers':>8} {'ms':>9} {'nodes/s':>9} {'speedup':>8}  (median ms)")
+	serial = {}
+	for depth in args.depths:
+		serial[depth], nodes_per_second = measure(None, depth, boards)
+		print(f"{depth:>5} {'serial':>8} {serial[depth]:>9.1f} {nodes_per_second:>9.0f} {1:>8.2f}")
+	for num_workers in args.workers:
+		shared_best = POOL_CONTEXT.Array('q', 1)
+		with create_process_pool(num_workers, initialize_search_worker, (shared_best,)) as pool:
+			# warm up, so worker start-up is not timed
+			list(pool.map(time.sleep, [0.1] * num_workers))
+			for depth in args.depths:
+				parallel_ms, nodes_per_second = measure((pool, shared_best), depth, boards)
+				print(f"{depth:>5} {num_workers:>8} {parallel_ms:>9.1f} {nodes_per_second:>9.0f} {serial[depth] / parallel_ms:>8.2f}")
@@ -0,0 +1,79 @@
+# Measures the Connect 4 search: nodes per second and time to reach each depth, over random midgame positions.
+# Run from the /backend folder:
+#   python -m benchmarks.connect4_search --depths 4 5 6 7 --budgets 50 200 1000
+
+import argparse
+import random
+import statistics
+import time
+
+from ai.game_pigeon.connect4.bitboard import Bitboard, PLAYER_INDEX, has_four
+from ai.game_pigeon.connect4.connect4 import AI_PIECE, USER_PIECE
+from ai.game_pigeon.connect4.connect4_strategy import Connect4Strategy
+from ai.game_pigeon.connect4.enums import BoardSpace
+from ai.game_pigeon.connect4.constants import NUM_ROWS, NUM_COLS
+
+
+def random_board(num_moves: int, rng: random.Random):
+	"""A board after `num_moves` random moves with no winner, starting with the user, so the AI is to move."""
+	while True:
+		position = Bitboard()
+		players = [PLAYER_INDEX[USER_PIECE], PLAYER_INDEX[AI_PIECE]]
+		for ply in range(num_moves):
+			player = players[ply % 2]
+			position.play(rng.choice(position.valid_moves()), player)
+			if has_four(position.pieces[player]):
+				break
+		else:
+			return to_matrix(position)
+
+
+def to_matrix(position: Bitboard):
+	board = [[BoardSpace.EMPTY for _ in range(NUM_COLS)] for _ in range(NUM_ROWS)]
+	for space, player in PLAYER_INDEX.items():
+		for row in range(NUM_ROWS):
+			for col in range(NUM_COLS):
+				if position.pieces[player] >> (col * (NUM_ROWS + 1) + row) & 1:
+					board[row][col] = space
+	return board
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--depths', type=int, nargs='+', default=[4, 5, 6, 7])
+	parser.add_argument('--positions', type=int, default=10)
+	parser.add_argument('--budgets', type=int, nargs='*', default=[], help="time budgets in ms to also measure")
+	args = parser.parse_args()
+	rng = random.Random(0)
+	boards = [random_board(2 * rng.randint(0, 8), rng) for _ in range(args.positions)]
+
+	print(f"{'depth':>5} {'ms':>9} {'nodes':>9} {'nodes/s':>9} {'table hits':>10}  (medians)")
+	for depth in args.depths:
+		times, nodes, hit_rates = [], [], []
+		for board in boards:
+			ai = Connect4Strategy(AI_PIECE)
+			start = time.perf_counter()
+			ai.get_move(board, depth)
+			times.append(time.perf_counter() - start)
+			nodes.append(ai.nodes_searched)
+			hit_rates.append(ai.table.stats().hit_rate)
+		print(
+			f"{depth:>5} {statistics.median(times) * 1000:>9.1f} {statistics.median(nodes):>9.0f} "
+			f"{sum(nodes) / sum(times):>9.0f} {statistics.median(hit_rates):>10.1%}"
+		)
+
+	if args.budgets:
+		print(f"\n{'budget':>6} {'ms':>9} {'depth':>6} {'nodes':>9}  (medians)")
+	for budget in args.budgets:
+		times, depths, nodes = [], [], []
+		for board in boards:
+			ai = Connect4Strategy(AI_PIECE)
+			start = time.perf_counter()
+			ai.get_move(board, NUM_ROWS * NUM_COLS, budget)
+			times.append(time.perf_counter() - start)
+			depths.append(ai.depth_reached)
+			nodes.append(ai.nodes_searched)
+		print(
+			f"{budget:>6} {statistics.median(times) * 1000:>9.1f} {statistics.median(depths):>6.0f} "
+			f"{statistics.median(nodes):>9.0f}"
+		)
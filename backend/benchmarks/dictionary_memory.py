@@ -0,0 +1,70 @@
+# Measures the memory each worker process spends on the dictionary, with a private
+# in-process build versus the shared memory-mapped snapshot.
+# Run from the /backend folder (Linux only, reads /proc):
+#   python -m benchmarks.dictionary_memory --workers 4
+
+import argparse
+import multiprocessing
+from typing import Dict
+
+from utils.dictionary_snapshot import load_dictionary
+
+MISSING_SNAPSHOT_PATH = 'data/does_not_exist.snapshot'
+
+
+def read_memory_kb() -> Dict[str, int]:
+    """
+    Reads this process's resident (Rss), proportional (Pss) and private (Private_*) memory in kB.
+    Pss splits each shared page evenly between the processes mapping it, so it is the fair per-worker cost.
+    """
+    memory = {'Rss': 0, 'Pss': 0, 'Private': 0}
+    with open('/proc/self/smaps_rollup') as file:
+        for line in file:
+            name, _, rest = line.partition(':')
+            value = int(rest.split()[0]) if rest.strip() else 0
+            if name in ('Rss', 'Pss'):
+                memory[name] = value
+            elif name in ('Private_Clean', 'Private_Dirty'):
+                memory['Private'] += value
+    return memory
+
+
+def worker(mode: str, loaded: multiprocessing.Barrier, measured: multiprocessing.Barrier, results) -> None:
+    before = read_memory_kb()
+    if mode == 'private':
+        dictionary = load_dictionary(snapshot_path=MISSING_SNAPSHOT_PATH, shared=False)
+    else:
+        dictionary = load_dictionary(shared=True)
+    # touch every page, as a long running worker eventually would
+    sum(len(word) for word in dictionary.words)
+    sum(dictionary.tree.children)
+    loaded.wait()
+    after = read_memory_kb()
+    results.put({name: after[name] - before[name] for name in after})
+    measured.wait()
+
+
+def measure(mode: str, num_workers: int) -> Dict[str, float]:
+    context = multiprocessing.get_context('spawn')  # uvicorn starts its workers with spawn
+    loaded, measured = context.Barrier(num_workers), context.Barrier(num_workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(mode, loaded, measured, results)) for _ in range(num_workers)]
+    for process in processes:
+        process.start()
+    deltas = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return {name: sum(delta[name] for delta in deltas) / num_workers / 1024 for name in deltas[0]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    load_dictionary(shared=True)  # make sure the snapshot exists before timing the shared mode
+
+    print(f"{'mode':<8} {'workers':>7} {'rss MB':>8} {'pss MB':>8} {'private MB':>10}  (per worker, dictionary only)")
+    for mode in ('private', 'shared'):
+        for num_workers in args.workers:
+            memory = measure(mode, num_workers)
+            print(f"{mode:<8} {num_workers:>7} {memory['Rss']:>8.1f} {memory['Pss']:>8.1f} {memory['Private']:>10.1f}")
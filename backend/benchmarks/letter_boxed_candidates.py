@@ -0,0 +1,73 @@
+# Compares two ways of listing the Letter Boxed candidate words: walking the word graph along letters that
+# may follow each other, and scanning the dictionary words made of the puzzle's letters.
+# Run from the /backend folder:
+#   python -m benchmarks.letter_boxed_candidates
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+import ai.nyt.letter_boxed as letter_boxed
+from utils.data_store import get_word_index, load_data_store
+from utils.word_games.word_index import letters_mask
+
+# puzzles in the daily format: 12 distinct letters, 3 on each side
+PUZZLES = [
+	["rdn", "oai", "euc", "tlp"],
+	["yhn", "ipt", "oca", "elr"],
+	["gmu", "rio", "aln", "cst"],
+	["wkb", "aed", "ilr", "ont"],
+	["fhy", "aeo", "lmr", "ctu"],
+	["pvx", "ine", "oat", "lrs"],
+	["bjq", "ual", "iet", "rsk"],
+	["dgz", "eoa", "rni", "lpc"],
+	["hmv", "auo", "ies", "tnr"],
+	["ckw", "eia", "srl", "tno"],
+]
+
+
+def scan_valid_words(letter_dict):
+	"""The dictionary scan that the graph walk replaced: check every word made of the puzzle's letters."""
+	words = []
+	index = get_word_index()
+	candidates = (
+		index.subset_of(letters_mask(letter_dict.keys()))
+		& (index.lengths >= letter_boxed.MIN_WORD_LENGTH)
+		& ~index.double_letters
+	)
+	for word_id in np.flatnonzero(candidates):
+		word = index.words[word_id]
+		if all(word[i + 1] in letter_dict[word[i]] for i in range(len(word) - 1)):
+			words.append(word)
+	return words
+
+
+def time_candidates(find, letter_dict, reps):
+	"""Returns the best time in ms over `reps` runs, and the words found."""
+	times = []
+	for _ in range(reps):
+		start = time.perf_counter()
+		words = find(letter_dict)
+		times.append((time.perf_counter() - start) * 1000)
+	return min(times), words
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--reps', type=int, default=5, help="runs per puzzle, the fastest is reported")
+	args = parser.parse_args()
+	load_data_store()
+
+	scan_times, walk_times = [], []
+	print(f"{'puzzle':>16} {'words':>6} {'scan ms':>8} {'walk ms':>8}")
+	for sides in PUZZLES:
+		letter_dict = letter_boxed.build_letter_dict([set(side) for side in sides])
+		scan_ms, scanned = time_candidates(scan_valid_words, letter_dict, args.reps)
+		walk_ms, walked = time_candidates(letter_boxed.get_valid_words, letter_dict, args.reps)
+		assert scanned == walked, f"candidates differ for {sides}"
+		scan_times.append(scan_ms)
+		walk_times.append(walk_ms)
+		print(f"{' '.join(sides):>16} {len(walked):>6} {scan_ms:>8.2f} {walk_ms:>8.2f}")
+	print(f"{'median':>16} {'':>6} {statistics.median(scan_times):>8.2f} {statistics.median(walk_times):>8.2f}")
@@ -0,0 +1,61 @@
+# Compares the two Word Bites engines as the number of pieces grows: growing words piece by piece
+# through the word graph, and checking the dictionary words that fit the pieces' letters.
+# Run from the /backend folder:
+#   python -m benchmarks.word_bites_engines
+
+import argparse
+import random
+import statistics
+import time
+
+import ai.game_pigeon.word_bites.word_bites as word_bites
+from benchmarks.word_hunt_scaling import LETTER_WEIGHTS
+from utils.data_store import get_word_index, get_words_tree, load_data_store
+
+
+def random_pieces(num_pieces: int, rng: random.Random):
+	"""Splits `num_pieces` into roughly equal numbers of singles, horizontal bars and vertical bars."""
+	def letters(count):
+		return ''.join(rng.choices(list(LETTER_WEIGHTS), weights=list(LETTER_WEIGHTS.values()), k=count))
+	num_singles = num_pieces - 2 * (num_pieces // 3)
+	singles = list(letters(num_singles))
+	horizontal = [letters(2) for _ in range(num_pieces // 3)]
+	vertical = [letters(2) for _ in range(num_pieces // 3)]
+	return singles, horizontal, vertical
+
+
+def time_engine(engine, pieces, data):
+	start = time.perf_counter()
+	solutions = engine(
+		*pieces,
+		data,
+		word_bites.DEFAULT_MIN_LENGTH,
+		word_bites.DEFAULT_MAX_HORIZONTAL_LENGTH,
+		word_bites.DEFAULT_MAX_VERTICAL_LENGTH
+	)
+	return (time.perf_counter() - start) * 1000, word_bites.rank_solutions(solutions)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--boards', type=int, default=5, help="random boards per piece count")
+	parser.add_argument('--pieces', type=int, nargs='+', default=[6, 8, 9, 10, 11, 12, 13, 14, 16, 18])
+	args = parser.parse_args()
+	load_data_store()
+	rng = random.Random(0)
+
+	print(f"{'pieces':>6} {'words':>6} {'graph ms':>9} {'word-first ms':>14}  (medians)")
+	for num_pieces in args.pieces:
+		graph_times, word_first_times, word_counts = [], [], []
+		for _ in range(args.boards):
+			pieces = random_pieces(num_pieces, rng)
+			graph_ms, graph_solutions = time_engine(word_bites.find_words, pieces, get_words_tree())
+			word_first_ms, word_first_solutions = time_engine(word_bites.find_words_word_first, pieces, get_word_index())
+			assert graph_solutions == word_first_solutions, f"engines disagree on {pieces}"
+			graph_times.append(graph_ms)
+			word_first_times.append(word_first_ms)
+			word_counts.append(len(graph_solutions))
+		print(
+			f"{num_pieces:>6} {statistics.median(word_counts):>6.0f} "
+			f"{statistics.median(graph_times):>9.1f} {statistics.median(word_first_times):>14.1f}"
+		)
@@ -0,0 +1,56 @@
+# Measures the speedup of the parallel Word Hunt search as the number of worker processes grows.
+# Run from the /backend folder:
+#   python -m benchmarks.word_hunt_parallel --workers 1 2 4 8
+# Compile the dictionary snapshot first (python -m utils.dictionary_snapshot) so workers start quickly.
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+import ai.game_pigeon.word_hunt.word_hunt as word_hunt
+from ai.game_pigeon.word_hunt.board_shapes import get_board_shape
+from benchmarks.word_hunt_scaling import random_letters
+from utils.data_store import load_data_store
+from utils.worker_pool import create_process_pool
+
+
+def measure(pool, num_workers: int, board_type: str, boards, limit):
+	"""Returns the median solve time in ms over the boards, in process if `pool` is None."""
+	shape = get_board_shape(board_type)
+	times = []
+	for letters in boards:
+		start = time.perf_counter()
+		if pool is None:
+			solutions = word_hunt.search_starts(shape, letters, word_hunt.DEFAULT_MIN_LENGTH, limit)
+		else:
+			solutions = word_hunt.search_in_parallel(pool, num_workers, shape, letters, word_hunt.DEFAULT_MIN_LENGTH, limit)
+		word_hunt.rank_solutions(solutions, limit)
+		times.append((time.perf_counter() - start) * 1000)
+	return statistics.median(times)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+	parser.add_argument('--boards', type=int, default=5, help="random boards per size")
+	parser.add_argument('--sizes', nargs='+', default=['5x5', '8x8', '12x12', '16x16'])
+	parser.add_argument('--limit', type=int, default=None, help="top-K mode instead of every word")
+	args = parser.parse_args()
+	load_data_store()
+	rng = random.Random(0)
+	boards = {board_type: [random_letters(get_board_shape(board_type).num_cells, rng) for _ in range(args.boards)] for board_type in args.sizes}
+
+	print(f"{os.cpu_count()} cores available")
+	serial = {board_type: measure(None, 1, board_type, boards[board_type], args.limit) for board_type in args.sizes}
+	print(f"{'board':>7} {'workers':>8} {'ms':>9} {'speedup':>8}  (medians)")
+	for board_type in args.sizes:
+		print(f"{board_type:>7} {'serial':>8} {serial[board_type]:>9.1f} {1:>8.2f}")
+	for num_workers in args.workers:
+		with create_process_pool(num_workers) as pool:
+			# warm up, so worker start-up is not timed
+			list(pool.map(time.sleep, [0.1] * num_workers))
+			for board_type in args.sizes:
+				parallel_ms = measure(pool, num_workers, board_type, boards[board_type], args.limit)
+				print(f"{board_type:>7} {num_workers:>8} {parallel_ms:>9.1f} {serial[board_type] / parallel_ms:>8.2f}")
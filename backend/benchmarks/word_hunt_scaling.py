@@ -0,0 +1,55 @@
+# Measures Word Hunt solve time and memory as the board area grows.
+# Run from the /backend folder:
+#   python -m benchmarks.word_hunt_scaling
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+import ai.game_pigeon.word_hunt.word_hunt as word_hunt
+from ai.game_pigeon.word_hunt.board_shapes import get_board_shape
+from utils.data_store import load_data_store
+
+# roughly the letter frequencies of English text, so random boards have a realistic number of words
+LETTER_WEIGHTS = {
+	'e': 12, 't': 9, 'a': 8, 'o': 8, 'i': 7, 'n': 7, 's': 6, 'h': 6, 'r': 6, 'd': 4, 'l': 4, 'c': 3, 'u': 3,
+	'm': 2, 'w': 2, 'f': 2, 'g': 2, 'y': 2, 'p': 2, 'b': 1, 'v': 1, 'k': 1, 'j': 1, 'x': 1, 'q': 1, 'z': 1,
+}
+
+
+def random_letters(num_cells: int, rng: random.Random):
+	return rng.choices(list(LETTER_WEIGHTS), weights=list(LETTER_WEIGHTS.values()), k=num_cells)
+
+
+def measure(board_type: str, num_boards: int, rng: random.Random):
+	"""Returns the median solve time in ms, the peak traced memory in KB, and the median number of words."""
+	shape = get_board_shape(board_type)
+	times, peaks, word_counts = [], [], []
+	for _ in range(num_boards):
+		letters = random_letters(shape.num_cells, rng)
+		start = time.perf_counter()
+		solutions = word_hunt.run(letters, board_type)
+		times.append((time.perf_counter() - start) * 1000)
+		word_counts.append(len(solutions))
+		# memory is measured on a second run, since tracing slows the solver down
+		tracemalloc.start()
+		word_hunt.run(letters, board_type)
+		peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+		tracemalloc.stop()
+	return statistics.median(times), statistics.median(peaks), statistics.median(word_counts)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--boards', type=int, default=5, help="random boards per size")
+	parser.add_argument('--sizes', nargs='+', default=['4x4', '5x5', '6x6', '8x8', '10x10', '12x12', '16x16'])
+	args = parser.parse_args()
+	load_data_store()
+	rng = random.Random(0)
+
+	print(f"{'board':>7} {'cells':>6} {'words':>7} {'ms':>9} {'peak KB':>9}  (medians)")
+	for board_type in args.sizes:
+		solve_ms, peak_kb, words = measure(board_type, args.boards, rng)
+		print(f"{board_type:>7} {get_board_shape(board_type).num_cells:>6} {words:>7.0f} {solve_ms:>9.1f} {peak_kb:>9.0f}")
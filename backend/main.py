@@ -1,24 +1,39 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-import logging
+import threading
+
+from utils.data_store import load_data_store, clear_data_store, is_data_ready
+from utils.error import DataNotReadyError
+from utils.worker_pool import start_worker_pool, shutdown_worker_pool
+from ai.game_pigeon.connect4.opening_book import load_opening_book
+from ai.game_pigeon.connect4.connect4 import start_search_pool, shutdown_search_pool
+from routers import nyt_mini_games, game_pigeon, health
+from routers.health import data_not_ready_handler
+
+
+def load_data() -> None:
+    """
+    Loads the word set, then starts the worker processes, on a background thread so neither delays serving.
+    """
+    load_data_store()
+    if is_data_ready():
+        start_worker_pool()
+    start_search_pool()  # the Connect 4 workers do not need the word set
 
-from utils.read_word_list import load_words
-from utils.data_store import set_common_word_set, set_words_tree, get_common_word_set, clear_data_store
-from utils.word_games.word_start_tree import build_tree
-from routers import nyt_mini_games, game_pigeon
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Load the word set
-    set_common_word_set(load_words('data/common_words.txt')) 
-    set_words_tree(build_tree(get_common_word_set()))
-    logging.info("Word set loaded successfully.")
+    threading.Thread(target=load_data, name="load-data-store", daemon=True).start()
+    load_opening_book()  # small, so it is loaded before serving
     yield
     # Clean up the word lists and release the resources
+    shutdown_worker_pool()
+    shutdown_search_pool()
     clear_data_store()
 
 app = FastAPI(lifespan=lifespan)
+app.add_exception_handler(DataNotReadyError, data_not_ready_handler)
 
 origins = [
     "http://localhost:3000",  # React dev server
@@ -34,5 +49,6 @@ app.add_middleware(
 )
 
 # Include the grouped routers
+app.include_router(health.router, tags=["Health"])
 app.include_router(nyt_mini_games.router, prefix="/api/nyt", tags=["NYT Mini Games"])
 app.include_router(game_pigeon.router, prefix="/api/game_pigeon", tags=["GamePigeon"])
\ No newline at end of file
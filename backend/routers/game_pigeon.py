@@ -1,14 +1,15 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, validator
-from typing import List, Dict, Tuple
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field, validator
+from typing import List, Dict, Tuple, Optional
 import logging
 import ai.game_pigeon.anagrams as anagrams
 import ai.game_pigeon.word_hunt.word_hunt as word_hunt
 import ai.game_pigeon.word_bites.word_bites as word_bites
 import ai.game_pigeon.connect4.connect4 as connect4
 from utils.ai_runner import run
-from utils.error import BackendError
+from utils.error import BackendError, DataNotReadyError
 from utils.model import CamelAliasModel
+from routers.health import require_data_ready
 
 router = APIRouter()
 
@@ -25,7 +26,7 @@ class AnagramsInput(BaseModel):
 class AnagramsOutput(BaseModel):
     words: List[str]  # Example: ["apple", "banana", "cherry"]
 
-@router.post("/anagrams")
+@router.post("/anagrams", dependencies=[Depends(require_data_ready)])
 async def solve_anagrams(input: AnagramsInput) -> AnagramsOutput:
     """
     Solve the Anagrams puzzle with the provided letters.
@@ -39,8 +40,11 @@ async def solve_anagrams(input: AnagramsInput) -> AnagramsOutput:
 #############
 class WordHuntInput(BaseModel):
     letters: List[str]
-    board_type: str
+    board_type: str  # "4x4", "5x5", "cross", "donut", any "{rows}x{cols}" rectangle, or a name for board_mask
     min_length: int = 3
+    board_mask: Optional[List[str]] = None  # custom layout, e.g. ["##.##", "#####"] where '.' is a hole
+    limit: Optional[int] = Field(default=None, ge=1)  # only return the highest scoring words
+    parallel: bool = False  # split the search across worker processes, for large boards
 
     @validator("letters", pre=True)
     def ensure_lowercase(cls, value: List[str]) -> List[str]:
@@ -49,7 +53,7 @@ class WordHuntInput(BaseModel):
 class WordHuntOutput(BaseModel):
     solutions: Dict[str, List[int]]  # Example: {"word": [0, 1, 2, 3], ...}
 
-@router.post("/word_hunt")
+@router.post("/word_hunt", dependencies=[Depends(require_data_ready)])
 async def solve_word_hunt(input: WordHuntInput) -> WordHuntOutput:
     """
     Solve the Anagrams puzzle with the provided letters.
@@ -59,7 +63,12 @@ async def solve_word_hunt(input: WordHuntInput) -> WordHuntOutput:
             word_hunt.run, 
             letters=input.letters, 
             board_type=input.board_type, 
-            min_length=input.min_length)
+            min_length=input.min_length,
+            board_mask=input.board_mask,
+            limit=input.limit,
+            parallel=input.parallel)
+    except DataNotReadyError:
+        raise  # answered by `data_not_ready_handler`
     except BackendError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -67,6 +76,29 @@ async def solve_word_hunt(input: WordHuntInput) -> WordHuntOutput:
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
     return WordHuntOutput(solutions=solutions)
 
+class WordHuntCacheStatsOutput(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+    hit_rate: float
+
+@router.get("/word_hunt/cache_stats")
+async def word_hunt_cache_stats() -> WordHuntCacheStatsOutput:
+    """
+    Report the hit rate and evictions of the Word Hunt solution cache.
+    """
+    stats = word_hunt.get_cache_stats()
+    return WordHuntCacheStatsOutput(
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        size=stats.size,
+        max_size=stats.max_size,
+        hit_rate=stats.hit_rate
+    )
+
 ##############
 # Word Bites #
 ##############
@@ -95,7 +127,7 @@ class WordBitesOutput(CamelAliasModel):
     solutions: List[WordBitesSolution]
 
 
-@router.post("/word_bites")
+@router.post("/word_bites", dependencies=[Depends(require_data_ready)])
 async def solve_word_bites(input: WordBitesInput) -> WordBitesOutput:
     """
     Solve the Word Bites puzzle with the provided pieces.
@@ -111,6 +143,8 @@ async def solve_word_bites(input: WordBitesInput) -> WordBitesOutput:
             horizontal_max_length=input.max_length_horizontal,
             vertical_max_length=input.max_length_vertical
         )
+    except DataNotReadyError:
+        raise  # answered by `data_not_ready_handler`
     except BackendError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -126,6 +160,9 @@ class Connect4Input(CamelAliasModel):
     player_locations: List[Tuple[int, int]]  # List of [row, col] for player's pieces
     ai_locations: List[Tuple[int, int]]  # List of [row, col] for AI's pieces
     max_search_depth: int = 6  # Default search depth
+    tie_break_seed: Optional[int] = None  # Varies the choice between equally good moves; by default it is deterministic
+    time_budget_ms: Optional[int] = None  # Stop deepening after this long; needed for depths over 10
+    parallel: bool = False  # split the root moves across worker processes, for deep searches
 
     @validator("player_locations", "ai_locations", pre=True)
     def ensure_valid_locations(cls, value: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
@@ -136,6 +173,8 @@ class Connect4Input(CamelAliasModel):
 class Connect4Output(CamelAliasModel):
     column: int  # The column chosen by the AI (0-indexed)
     is_win: bool  # Whether the move results in a win
+    depth_reached: int  # The deepest search that completed
+    nodes_searched: int  # The number of positions searched
     
 
 @router.post("/connect4")
@@ -145,18 +184,45 @@ async def solve_connect4(input: Connect4Input) -> Connect4Output:
     """
     try:
         # Placeholder for actual Connect 4 implementation
-        column, is_win = run(
+        column, is_win, depth_reached, nodes_searched = run(
             connect4.run, 
             player_locations=input.player_locations, 
             ai_locations=input.ai_locations,
-            max_search_depth=input.max_search_depth
+            max_search_depth=input.max_search_depth,
+            tie_break_seed=input.tie_break_seed,
+            time_budget_ms=input.time_budget_ms,
+            parallel=input.parallel
         )
     except BackendError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error("Unexpected error in connect 4:", exc_info=True)
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
-    return Connect4Output(column=column, is_win=is_win)
+    return Connect4Output(column=column, is_win=is_win, depth_reached=depth_reached, nodes_searched=nodes_searched)
+
+
+class Connect4TableStatsOutput(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+    hit_rate: float
+
+@router.get("/connect4/table_stats")
+async def connect4_table_stats() -> Connect4TableStatsOutput:
+    """
+    Report the hits, misses and evictions of the Connect 4 transposition table.
+    """
+    stats = connect4.get_table_stats()
+    return Connect4TableStatsOutput(
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        size=stats.size,
+        max_size=stats.max_size,
+        hit_rate=stats.hit_rate
+    )
 
 
 class Connect4GameOverInput(CamelAliasModel):
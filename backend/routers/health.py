@@ -0,0 +1,71 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Optional
+from utils.data_store import get_load_status, has_load_failed, is_data_ready
+from utils.error import DataLoadFailedError, DataNotReadyError
+
+router = APIRouter()
+
+# How long clients should wait before retrying a request rejected because the word set is still loading
+RETRY_AFTER_SECONDS = 2
+
+
+def require_data_ready() -> None:
+    """
+    Dependency for endpoints that use the word set. Rejects requests with a retryable 503 until it has loaded,
+    or with a 500 if it failed to load.
+    """
+    if has_load_failed():
+        raise HTTPException(status_code=500, detail=f"The word set failed to load: {get_load_status().error}")
+    if not is_data_ready():
+        raise HTTPException(
+            status_code=503,
+            detail="The word set is still loading. Please retry shortly.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+
+
+async def data_not_ready_handler(request: Request, error: DataNotReadyError) -> JSONResponse:
+    """
+    Exception handler for a DataNotReadyError raised past `require_data_ready`, e.g. by a worker process:
+    a 500 if the word set failed to load, otherwise a retryable 503.
+    """
+    if isinstance(error, DataLoadFailedError):
+        return JSONResponse(status_code=500, content={"detail": str(error)})
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(error)},
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+    )
+
+
+class ReadinessOutput(BaseModel):
+    ready: bool
+    stage: str
+    progress: float  # fraction of the load completed, from 0 to 1
+    error: Optional[str] = None
+
+
+@router.get("/healthz")
+async def healthz():
+    """
+    Liveness check. Succeeds as soon as the server is accepting requests, and fails with 503 if the word set
+    failed to load, so the orchestrator restarts the server rather than leaving it unable to solve anything.
+    """
+    status = get_load_status()
+    if has_load_failed():
+        return JSONResponse(status_code=503, content={"status": "failed", "error": status.error})
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz() -> ReadinessOutput:
+    """
+    Readiness check. Returns 503 with the load progress until the word set has loaded.
+    """
+    status = get_load_status()
+    output = ReadinessOutput(ready=status.ready, stage=status.stage, progress=status.progress, error=status.error)
+    if not status.ready:
+        return JSONResponse(status_code=503, content=output.model_dump(), headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    return output
\ No newline at end of file
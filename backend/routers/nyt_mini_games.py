@@ -1,12 +1,15 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from typing import List, Optional
 import ai.nyt.spelling_bee as spelling_bee
 import ai.nyt.letter_boxed as letter_boxed
 import utils.profiling as pf
 from utils.ai_runner import run
+from utils.error import BackendError
+from routers.health import require_data_ready
 
-router = APIRouter()
+# every NYT solver uses the word set
+router = APIRouter(dependencies=[Depends(require_data_ready)])
 
 class SpellingBeeInput(BaseModel):
     center_letter: str
@@ -25,6 +28,9 @@ async def solve_spelling_bee(input: SpellingBeeInput):
 class LetterBoxedInput(BaseModel):
     letter_sides: List[List[str]]
     max_solutions_length: int
+    # return only the best solutions, by word count then total letters; None returns the best solution
+    # starting with each word, ranked the same way
+    max_results: Optional[int] = Field(default=None, ge=1)
 
 @router.post("/letter_boxed")
 async def solve_letter_boxed(input: LetterBoxedInput):
@@ -34,6 +40,9 @@ async def solve_letter_boxed(input: LetterBoxedInput):
     lower_letter_sides = [[letter.lower() for letter in side] for side in input.letter_sides]
     letter_sets = [set(side) for side in lower_letter_sides]
 
-    solutions = run(letter_boxed.run, letter_sets, input.max_solutions_length)
+    try:
+        solutions = run(letter_boxed.run, letter_sets, input.max_solutions_length, input.max_results)
+    except BackendError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {"solutions": solutions}
\ No newline at end of file
@@ -1,46 +1,168 @@
-from typing import Set
-from utils.word_games.words_tree_node import WordsTreeNode
+import logging
+from dataclasses import dataclass, replace
+from typing import Collection, Optional
+from utils.dictionary_snapshot import load_dictionary
+from utils.error import DataLoadFailedError, DataNotReadyError
+from utils.word_games.dawg import Dawg
+from utils.word_games.spelling_bee_table import SpellingBeeTable
+from utils.word_games.word_index import WordIndex
 
-# A set of common English words typically used in word games
-_common_word_set: Set[str] = set()
 
-def set_common_word_set(words: set) -> None:
+@dataclass(frozen=True)
+class LoadStatus:
     """
-    Sets the common word set to the provided set of words.
+    Progress of the background dictionary load.
+
+    Attributes:
+        ready (bool): Whether the dictionary has finished loading.
+        stage (str): A short description of what the load is doing.
+        progress (float): Fraction of the load completed, from 0 to 1.
+        error (Optional[str]): The error message if the load failed.
+    """
+    ready: bool = False
+    stage: str = "not started"
+    progress: float = 0.0
+    error: Optional[str] = None
+
+_load_status = LoadStatus()
+
+def set_load_progress(stage: str, progress: float) -> None:
+    """
+    Records the progress of the dictionary load.
+
+    Parameters:
+        stage (str): A short description of what the load is doing.
+        progress (float): Fraction of the load completed, from 0 to 1.
+    """
+    global _load_status
+    _load_status = replace(_load_status, stage=stage, progress=progress)
+
+def mark_data_ready() -> None:
+    global _load_status
+    _load_status = LoadStatus(ready=True, stage="ready", progress=1.0)
+
+def mark_load_failed(error: str) -> None:
+    global _load_status
+    _load_status = replace(_load_status, stage="failed", error=error)
+
+def get_load_status() -> LoadStatus:
+    return _load_status
+
+def is_data_ready() -> bool:
+    return _load_status.ready
+
+def has_load_failed() -> bool:
+    return _load_status.stage == "failed"
+
+def _require_data_ready() -> None:
+    if has_load_failed():
+        raise DataLoadFailedError(f"The word set failed to load: {_load_status.error}")
+    if not _load_status.ready:
+        raise DataNotReadyError(f"The word set is still loading ({_load_status.stage}).")
+
+
+# A collection of common English words typically used in word games.
+# Either a set, or a PackedWordList backed by the dictionary snapshot.
+_common_word_set: Collection[str] = set()
+
+def set_common_word_set(words: Collection[str]) -> None:
+    """
+    Sets the common word set to the provided collection of words.
     
     Parameters:
-        words (set): A set of words to be used as the common word set.
+        words (Collection[str]): A collection of words to be used as the common word set.
     """
     global _common_word_set
     _common_word_set = words
 
-def get_common_word_set() -> set:
+def get_common_word_set() -> Collection[str]:
+    _require_data_ready()
     return _common_word_set
 
 
-# A tree structure to store words for Word Games. 
+# A minimized word graph (DAWG) to store words for Word Games.
 # Later letters in a word are stored as children of the previous letters.
-_words_tree: WordsTreeNode = None
+_words_tree: Dawg = None
 
-def set_words_tree(tree) -> None:
+def set_words_tree(tree: Dawg) -> None:
     """
     Sets the words tree to the provided tree structure.
     
     Parameters:
-        tree: A tree structure containing words for Word Games.
+        tree (Dawg): A word graph containing words for Word Games.
     """
     global _words_tree
     _words_tree = tree
 
-def get_words_tree() -> WordsTreeNode:
+def get_words_tree() -> Dawg:
+    _require_data_ready()
     return _words_tree
 
 
+# Per-word metadata arrays (letter masks, lengths, ...) for whole-dictionary scans.
+# Entry i describes the i-th word of the common word set, which is sorted.
+_word_index: WordIndex = None
+
+def set_word_index(index: WordIndex) -> None:
+    """
+    Sets the word index to the provided index.
+
+    Parameters:
+        index (WordIndex): The metadata index of the common word set.
+    """
+    global _word_index
+    _word_index = index
+
+def get_word_index() -> WordIndex:
+    _require_data_ready()
+    return _word_index
+
+
+# Spelling Bee answers precomputed at load time, grouped by distinct-letter mask.
+_spelling_bee_table: SpellingBeeTable = None
+
+def set_spelling_bee_table(table: SpellingBeeTable) -> None:
+    """
+    Sets the Spelling Bee table to the provided table.
+
+    Parameters:
+        table (SpellingBeeTable): The precomputed Spelling Bee answers.
+    """
+    global _spelling_bee_table
+    _spelling_bee_table = table
+
+def get_spelling_bee_table() -> SpellingBeeTable:
+    _require_data_ready()
+    return _spelling_bee_table
+
+
 # Clear all data from data store
 def clear_data_store() -> None:
     """
     Clears all data from the data store.
     """
-    global _words_tree
-    _common_word_set.clear()
-    _words_tree = None
\ No newline at end of file
+    global _common_word_set, _words_tree, _word_index, _spelling_bee_table, _load_status
+    _common_word_set = set()
+    _words_tree = None
+    _word_index = None
+    _spelling_bee_table = None
+    _load_status = LoadStatus()
+
+
+def load_data_store() -> None:
+    """
+    Loads the word set and its derived structures into the data store, from the prebuilt snapshot
+    if there is an up to date one. The server runs this in a background thread so it can answer
+    health checks while it loads; progress is reported by /readyz.
+    """
+    try:
+        dictionary = load_dictionary(on_progress=set_load_progress)
+        set_common_word_set(dictionary.words)
+        set_words_tree(dictionary.tree)
+        set_word_index(dictionary.index)
+        set_spelling_bee_table(dictionary.spelling_bee_table)
+        mark_data_ready()
+        logging.info("Word set loaded successfully.")
+    except Exception as e:
+        logging.error("Failed to load the word set:", exc_info=True)
+        mark_load_failed(str(e))
@@ -0,0 +1,316 @@
+# Prebuilt binary snapshot of the dictionary data used by the word games.
+# Compile it offline from the /backend folder with:
+#   python -m utils.dictionary_snapshot
+#
+# Layout (all integers native byte order):
+#   header:        magic (8s), format version (I), byte order check (I), section count (I),
+#                  payload crc32 (I), sha256 of the source word list (32s)
+#   section table: one (name (32s), offset (Q), length (Q)) entry per section
+#   payload:       the sections, each aligned to 8 bytes
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import zlib
+import numpy as np
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Collection, Dict, Iterator, Optional
+
+from utils.read_word_list import load_words
+from utils.word_games.dawg import Dawg
+from utils.word_games.packed_word_list import PackedWordList
+from utils.word_games.spelling_bee_table import SpellingBeeTable, build_spelling_bee_arrays
+from utils.word_games.word_index import WordIndex, build_index_arrays
+from utils.word_games.word_start_tree import build_tree
+
+MAGIC = b'KGWORDS\x00'
+FORMAT_VERSION = 7
+BYTE_ORDER_CHECK = 0x01020304
+SECTION_ALIGNMENT = 8
+
+_HEADER = struct.Struct('=8sIIII32s')
+_SECTION_ENTRY = struct.Struct('=32sQQ')
+
+DEFAULT_WORD_LIST_PATH = 'data/common_words.txt'
+DEFAULT_SNAPSHOT_PATH = 'data/common_words.snapshot'
+
+# When set, the first worker to start compiles a missing or stale snapshot and every worker maps
+# that same file, so the dictionary pages are shared between worker processes instead of duplicated.
+SHARE_DICTIONARY = os.getenv('SHARED_DICTIONARY', '0') == '1'
+
+
+@dataclass
+class DictionaryData:
+    """
+    The dictionary structures shared by the word game solvers.
+    """
+    words: PackedWordList
+    tree: Dawg
+    index: WordIndex
+    spelling_bee_table: SpellingBeeTable
+
+
+def _resolve(file_path: str) -> Path:
+    """Resolves a path relative to the /backend folder, like `load_words` does."""
+    return Path(__file__).parent.parent / file_path
+
+
+def source_digest(word_list_path: str = DEFAULT_WORD_LIST_PATH) -> bytes:
+    """
+    Computes the sha256 digest of a word list file, used to detect stale snapshots.
+
+    Parameters:
+        word_list_path (str): The path to the word list, relative to /backend.
+
+    Returns:
+        bytes: The 32 byte digest.
+    """
+    with open(_resolve(word_list_path), 'rb') as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def build_sections(words: Collection[str]) -> Dict[str, bytes]:
+    """
+    Builds the dictionary structures from a word list and serializes them into snapshot sections.
+    Words containing anything other than lowercase letters are skipped.
+
+    Parameters:
+        words (Collection[str]): The words to include.
+
+    Returns:
+        Dict[str, bytes]: The raw bytes of each section, keyed by section name.
+    """
+    sorted_words = sorted(word for word in words if word.isascii() and word.isalpha() and word.islower())
+    blob = ''.join(sorted_words).encode('ascii')
+    offsets = array('i', [0])
+    for word in sorted_words:
+        offsets.append(offsets[-1] + len(word))
+    tree = build_tree(sorted_words)
+    sections = {
+        'words': blob,
+        'word_offsets': offsets.tobytes(),
+        'dawg_children': tree.children.tobytes(),
+        'dawg_end': bytes(tree.end_of_word),
+        'dawg_max_suffix_length': bytes(tree.max_suffix_length),
+        'dawg_min_suffix_length': bytes(tree.min_suffix_length),
+        'dawg_suffix_letter_masks': tree.suffix_letter_masks.tobytes(),
+    }
+    index_arrays = build_index_arrays(blob, offsets)
+    for name, values in index_arrays.items():
+        sections[f'index_{name}'] = values.tobytes()
+    bee_arrays = build_spelling_bee_arrays(
+        index_arrays['letter_masks'], index_arrays['lengths'], index_arrays['unique_letter_counts']
+    )
+    for name, values in bee_arrays.items():
+        sections[f'spelling_bee_{name}'] = values.tobytes()
+    return sections
+
+
+def dictionary_from_sections(sections: Dict[str, memoryview]) -> DictionaryData:
+    """
+    Wraps snapshot sections in the structures used by the solvers, without copying them.
+
+    Parameters:
+        sections (Dict[str, memoryview]): The sections of a snapshot.
+
+    Returns:
+        DictionaryData: The dictionary structures backed by the section buffers.
+    """
+    words = PackedWordList(sections['words'], sections['word_offsets'].cast('i'))
+    tree = Dawg(
+        children=sections['dawg_children'].cast('i'),
+        end_of_word=sections['dawg_end'],
+        max_suffix_length=sections['dawg_max_suffix_length'],
+        min_suffix_length=sections['dawg_min_suffix_length'],
+        suffix_letter_masks=sections['dawg_suffix_letter_masks'].cast('I')
+    )
+    index = WordIndex(
+        words=words,
+        letter_masks=np.frombuffer(sections['index_letter_masks'], dtype=np.uint32),
+        lengths=np.frombuffer(sections['index_lengths'], dtype=np.uint8),
+        first_letters=np.frombuffer(sections['index_first_letters'], dtype=np.uint8),
+        last_letters=np.frombuffer(sections['index_last_letters'], dtype=np.uint8),
+        double_letters=np.frombuffer(sections['index_double_letters'], dtype=bool),
+        unique_letter_counts=np.frombuffer(sections['index_unique_letter_counts'], dtype=np.uint8),
+        letter_counts=np.frombuffer(sections['index_letter_counts'], dtype=np.uint8).reshape(-1, 26),
+    )
+    spelling_bee_table = SpellingBeeTable(
+        bucket_masks=np.frombuffer(sections['spelling_bee_bucket_masks'], dtype=np.uint32),
+        bucket_starts=np.frombuffer(sections['spelling_bee_bucket_starts'], dtype=np.int32),
+        word_ids=np.frombuffer(sections['spelling_bee_word_ids'], dtype=np.int32),
+    )
+    return DictionaryData(words=words, tree=tree, index=index, spelling_bee_table=spelling_bee_table)
+
+
+def write_snapshot(snapshot_path: str, sections: Dict[str, bytes], digest: bytes) -> None:
+    """
+    Writes sections to a snapshot file. The file is replaced atomically so readers never see a partial write.
+
+    Parameters:
+        snapshot_path (str): The path to write to, relative to /backend.
+        sections (Dict[str, bytes]): The raw bytes of each section, keyed by section name.
+        digest (bytes): The sha256 digest of the source word list.
+    """
+    table_size = _HEADER.size + _SECTION_ENTRY.size * len(sections)
+    payload = bytearray()
+    entries = []
+    for name, data in sections.items():
+        payload.extend(b'\x00' * (-(table_size + len(payload)) % SECTION_ALIGNMENT))
+        entries.append(_SECTION_ENTRY.pack(name.encode('ascii'), table_size + len(payload), len(data)))
+        payload.extend(data)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER_CHECK, len(sections), zlib.crc32(payload), digest)
+    full_path = _resolve(snapshot_path)
+    temp_path = full_path.with_name(f'{full_path.name}.{os.getpid()}.tmp')
+    with open(temp_path, 'wb') as file:
+        file.write(header)
+        file.write(b''.join(entries))
+        file.write(payload)
+    os.replace(temp_path, full_path)
+
+
+def read_snapshot(snapshot_path: str, digest: Optional[bytes] = None) -> Optional[Dict[str, memoryview]]:
+    """
+    Memory-maps a snapshot file and validates it.
+
+    Parameters:
+        snapshot_path (str): The path to the snapshot, relative to /backend.
+        digest (Optional[bytes]): If given, the snapshot is rejected unless it was built from a word list with this digest.
+
+    Returns:
+        Dict[str, memoryview] | None: Views into the mapped file keyed by section name,
+            or None if the snapshot is missing, corrupt, from another format version, or stale.
+    """
+    full_path = _resolve(snapshot_path)
+    try:
+        with open(full_path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    view = memoryview(mapped)
+    if len(view) < _HEADER.size:
+        logging.warning(f"Dictionary snapshot {full_path} is truncated.")
+        return None
+    magic, version, byte_order, section_count, crc, snapshot_digest = _HEADER.unpack_from(view)
+    if magic != MAGIC or version != FORMAT_VERSION or byte_order != BYTE_ORDER_CHECK:
+        logging.warning(f"Dictionary snapshot {full_path} has an unsupported format.")
+        return None
+    if digest is not None and snapshot_digest != digest:
+        logging.warning(f"Dictionary snapshot {full_path} is stale.")
+        return None
+
+    table_size = _HEADER.size + _SECTION_ENTRY.size * section_count
+    if len(view) < table_size or zlib.crc32(view[table_size:]) != crc:
+        logging.warning(f"Dictionary snapshot {full_path} failed its checksum.")
+        return None
+
+    sections = {}
+    for index in range(section_count):
+        name, offset, length = _SECTION_ENTRY.unpack_from(view, _HEADER.size + index * _SECTION_ENTRY.size)
+        sections[name.rstrip(b'\x00').decode('ascii')] = view[offset:offset + length]
+    return sections
+
+
+@contextmanager
+def _snapshot_lock(snapshot_path: str) -> Iterator[None]:
+    """
+    Holds an exclusive lock on a file next to the snapshot, so only one process compiles it at a time.
+    Without fcntl (e.g. on Windows) no lock is taken, and concurrent compiles just duplicate work.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(_resolve(f'{snapshot_path}.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _compile_shared_snapshot(word_list_path: str, snapshot_path: str, digest: bytes) -> Optional[Dict[str, memoryview]]:
+    """
+    Compiles the snapshot if no other worker has done so yet, then maps it.
+
+    Returns:
+        Dict[str, memoryview] | None: The snapshot sections, or None if the snapshot could not be written.
+    """
+    try:
+        with _snapshot_lock(snapshot_path):
+            sections = read_snapshot(snapshot_path, digest)
+            if sections is None:
+                logging.info("Compiling the shared dictionary snapshot.")
+                write_snapshot(snapshot_path, build_sections(load_words(word_list_path)), digest)
+                sections = read_snapshot(snapshot_path, digest)
+            return sections
+    except OSError:
+        logging.warning("Could not write the shared dictionary snapshot.", exc_info=True)
+        return None
+
+
+def load_dictionary(
+        word_list_path: str = DEFAULT_WORD_LIST_PATH,
+        snapshot_path: str = DEFAULT_SNAPSHOT_PATH,
+        shared: bool = SHARE_DICTIONARY,
+        on_progress: Optional[Callable[[str, float], None]] = None
+    ) -> DictionaryData:
+    """
+    Loads the dictionary from its snapshot, falling back to building it from the word list
+    if the snapshot is missing or stale.
+
+    Parameters:
+        word_list_path (str): The path to the word list, relative to /backend.
+        snapshot_path (str): The path to the snapshot, relative to /backend.
+        shared (bool): If True, compile a missing or stale snapshot (once across all workers)
+            and map it, instead of building a private copy of the dictionary.
+        on_progress (Optional[Callable[[str, float], None]]): Called with a stage description and
+            the fraction completed as the load advances.
+
+    Returns:
+        DictionaryData: The loaded dictionary.
+    """
+    report = on_progress or (lambda stage, progress: None)
+    report("reading snapshot", 0.0)
+    digest = source_digest(word_list_path)
+    sections = read_snapshot(snapshot_path, digest)
+    if sections is None and shared:
+        report("compiling shared snapshot", 0.1)
+        sections = _compile_shared_snapshot(word_list_path, snapshot_path, digest)
+    if sections is not None:
+        logging.info("Word set loaded from snapshot.")
+        return dictionary_from_sections(sections)
+
+    logging.info("No usable dictionary snapshot, building the word set from the word list.")
+    report("reading word list", 0.1)
+    words = load_words(word_list_path)
+    report("building word graph and index", 0.3)
+    sections = build_sections(words)
+    return dictionary_from_sections({name: memoryview(data) for name, data in sections.items()})
+
+
+def compile_snapshot(
+        word_list_path: str = DEFAULT_WORD_LIST_PATH,
+        snapshot_path: str = DEFAULT_SNAPSHOT_PATH
+    ) -> None:
+    """
+    Builds the dictionary structures from the word list and writes them to a snapshot.
+
+    Parameters:
+        word_list_path (str): The path to the word list, relative to /backend.
+        snapshot_path (str): The path to write the snapshot to, relative to /backend.
+    """
+    digest = source_digest(word_list_path)
+    write_snapshot(snapshot_path, build_sections(load_words(word_list_path)), digest)
+
+
+if __name__ == "__main__":
+    compile_snapshot()
+    print(f"Wrote {_resolve(DEFAULT_SNAPSHOT_PATH)}")
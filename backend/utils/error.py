@@ -1,3 +1,17 @@
 class BackendError(Exception):
     """Base class for all backend errors."""
-    pass
\ No newline at end of file
+    pass
+
+
+class DataNotReadyError(Exception):
+    """
+    Raised when a solver needs the dictionary but it is not available. Raised as is while the dictionary is
+    still loading, when a later retry can succeed; check for DataLoadFailedError before treating it as retryable.
+    Not a BackendError, since it is not a problem with the request.
+    """
+    pass
+
+
+class DataLoadFailedError(DataNotReadyError):
+    """Raised when a solver needs the dictionary but it failed to load. Retrying will not help."""
+    pass
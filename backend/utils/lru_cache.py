@@ -0,0 +1,96 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar('V')
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Counters of an LRUCache.
+
+    Attributes:
+        hits (int): Lookups that found a value.
+        misses (int): Lookups that found nothing.
+        evictions (int): Values dropped to make room for newer ones.
+        size (int): The number of values currently cached.
+        max_size (int): The capacity of the cache.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[V]):
+    """
+    A bounded, thread-safe mapping that evicts the least recently used value when full.
+
+    Attributes:
+        max_size (int): The maximum number of values kept. 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._values: 'OrderedDict[Hashable, V]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Parameters:
+            key (Hashable): The key to look up.
+
+        Returns:
+            V | None: The cached value, or None if the key is not cached.
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._values.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        """
+        Caches a value, evicting the least recently used one if the cache is full.
+
+        Parameters:
+            key (Hashable): The key to cache the value under.
+            value (V): The value, which must not be None.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drops every cached value. The counters are kept."""
+        with self._lock:
+            self._values.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._values),
+                max_size=self.max_size
+            )
@@ -0,0 +1,127 @@
+from typing import List, Sequence
+
+ALPHABET_SIZE = 26
+ROOT = 0  # id of the root node, which represents the empty prefix
+NO_NODE = -1  # returned by child lookups when there is no such child
+
+
+def letter_code(letter: str) -> int:
+    """
+    Encodes a letter as an integer from 0-25.
+
+    Parameters:
+        letter (str): A single lowercase letter.
+
+    Returns:
+        int: The letter code, or -1 if the input is not a single lowercase letter.
+    """
+    if len(letter) != 1 or not 'a' <= letter <= 'z':
+        return -1
+    return ord(letter) - 97
+
+
+def encode_word(word: str) -> List[int]:
+    """
+    Encodes every letter of a word with `letter_code`.
+
+    Parameters:
+        word (str): The word to encode.
+
+    Returns:
+        List[int]: The letter codes of the word.
+    """
+    return [letter_code(letter) for letter in word]
+
+
+class Dawg():
+    """
+    A minimized directed acyclic word graph (a trie whose identical suffixes are shared),
+    stored in flat integer arrays instead of one Python object per node.
+
+    Nodes are identified by integer ids, with the root at id 0. Letters are encoded as 0-25.
+    Every node also carries summaries of the words below it, so searches can skip subtrees that cannot
+    produce a word with the letters or length they have left. A node's suffixes are the paths from it to
+    the end of a word, including the empty path if the node ends a word itself.
+
+    Attributes:
+        children (Sequence[int]): Child table. `children[node * 26 + code]` is the id of the
+            child of `node` for the letter `code`, or -1 if there is no such child.
+        end_of_word (Sequence[int]): `end_of_word[node]` is 1 if the node marks the end of a word, else 0.
+        max_suffix_length (Sequence[int]): The number of letters in the longest suffix of each node.
+        min_suffix_length (Sequence[int]): The number of letters in the shortest suffix of each node.
+        suffix_letter_masks (Sequence[int]): The 26-bit mask of the letters used by any suffix of each node.
+    """
+
+    def __init__(
+            self,
+            children: Sequence[int],
+            end_of_word: Sequence[int],
+            max_suffix_length: Sequence[int],
+            min_suffix_length: Sequence[int],
+            suffix_letter_masks: Sequence[int]
+        ):
+        self.children = children
+        self.end_of_word = end_of_word
+        self.max_suffix_length = max_suffix_length
+        self.min_suffix_length = min_suffix_length
+        self.suffix_letter_masks = suffix_letter_masks
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.end_of_word)
+
+    def child(self, node: int, code: int) -> int:
+        """
+        Looks up the child of a node for an encoded letter.
+
+        Parameters:
+            node (int): The parent node id.
+            code (int): The letter code (0-25).
+
+        Returns:
+            int: The child node id, or -1 if there is no such child.
+        """
+        return self.children[node * ALPHABET_SIZE + code]
+
+    def get_child(self, node: int, letter: str) -> int:
+        """
+        Looks up the child of a node for a letter, accepting any string.
+
+        Parameters:
+            node (int): The parent node id.
+            letter (str): The letter to follow.
+
+        Returns:
+            int: The child node id, or -1 if there is no such child.
+        """
+        code = letter_code(letter)
+        if node == NO_NODE or code == -1:
+            return NO_NODE
+        return self.children[node * ALPHABET_SIZE + code]
+
+    def is_end_of_word(self, node: int) -> bool:
+        return self.end_of_word[node] == 1
+
+    def find(self, word: str) -> int:
+        """
+        Follows a word from the root.
+
+        Parameters:
+            word (str): The prefix to follow.
+
+        Returns:
+            int: The node id reached, or -1 if the prefix is not in the graph.
+        """
+        node = ROOT
+        for letter in word:
+            node = self.get_child(node, letter)
+            if node == NO_NODE:
+                break
+        return node
+
+    def __contains__(self, word: str) -> bool:
+        node = self.find(word)
+        return node != NO_NODE and self.is_end_of_word(node)
+
+    def __str__(self) -> str:
+        return f"Dawg(num_nodes={self.num_nodes})"
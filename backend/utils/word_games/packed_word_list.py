@@ -0,0 +1,39 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Iterator
+
+
+class PackedWordList(Sequence):
+    """
+    A read-only, sorted list of words packed into a single byte buffer.
+    Words are decoded on access, so no Python string is created until it is needed.
+
+    Attributes:
+        blob (bytes-like): The ASCII bytes of all the words, concatenated in sorted order.
+        offsets (Sequence[int]): Word `i` is `blob[offsets[i]:offsets[i + 1]]`.
+    """
+
+    def __init__(self, blob, offsets: Sequence):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word index out of range")
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], 'ascii')
+
+    def __iter__(self) -> Iterator[str]:
+        blob, offsets = self.blob, self.offsets
+        for index in range(len(offsets) - 1):
+            yield str(blob[offsets[index]:offsets[index + 1]], 'ascii')
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        index = bisect_left(self, word)
+        return index < len(self) and self[index] == word
@@ -0,0 +1,68 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List
+
+# Spelling Bee puzzles have 7 letters and only accept words of 4 or more letters
+MAX_DISTINCT_LETTERS = 7
+MIN_WORD_LENGTH = 4
+
+
+@dataclass
+class SpellingBeeTable:
+    """
+    Precomputed Spelling Bee answers: the eligible words grouped into buckets by their distinct-letter mask.
+    Within a bucket, words are sorted longest first, then alphabetically.
+
+    Attributes:
+        bucket_masks (np.ndarray): uint32, the sorted distinct-letter masks that have at least one word.
+        bucket_starts (np.ndarray): int32, bucket `b` is `word_ids[bucket_starts[b]:bucket_starts[b + 1]]`.
+        word_ids (np.ndarray): int32, indices into the sorted word list, grouped by bucket.
+    """
+    bucket_masks: np.ndarray
+    bucket_starts: np.ndarray
+    word_ids: np.ndarray
+
+    def lookup(self, letter_masks: List[int]) -> List[np.ndarray]:
+        """
+        Looks up the buckets of several letter masks at once.
+
+        Parameters:
+            letter_masks (List[int]): The distinct-letter masks to look up.
+
+        Returns:
+            List[np.ndarray]: The word ids of each mask's bucket (empty if the mask has no words), in input order.
+        """
+        empty = self.word_ids[:0]
+        if len(self.bucket_masks) == 0:
+            return [empty for _ in letter_masks]
+        queries = np.asarray(letter_masks, dtype=np.uint32)
+        positions = np.minimum(np.searchsorted(self.bucket_masks, queries), len(self.bucket_masks) - 1)
+        found = self.bucket_masks[positions] == queries
+        return [
+            self.word_ids[self.bucket_starts[position]:self.bucket_starts[position + 1]] if is_found else empty
+            for position, is_found in zip(positions.tolist(), found.tolist())
+        ]
+
+
+def build_spelling_bee_arrays(letter_masks: np.ndarray, lengths: np.ndarray, unique_letter_counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Groups the words that can be Spelling Bee answers by distinct-letter mask.
+
+    Parameters:
+        letter_masks (np.ndarray): The letter mask of each word, from the WordIndex.
+        lengths (np.ndarray): The length of each word, from the WordIndex.
+        unique_letter_counts (np.ndarray): The distinct-letter count of each word, from the WordIndex.
+
+    Returns:
+        Dict[str, np.ndarray]: The table arrays, keyed by SpellingBeeTable attribute name.
+    """
+    word_ids = np.flatnonzero((unique_letter_counts <= MAX_DISTINCT_LETTERS) & (lengths >= MIN_WORD_LENGTH))
+    # sort by mask, then longest first, then by word id (alphabetical)
+    order = np.lexsort((word_ids, -lengths[word_ids].astype(np.int32), letter_masks[word_ids]))
+    word_ids = word_ids[order].astype(np.int32)
+    bucket_masks, bucket_starts = np.unique(letter_masks[word_ids], return_index=True)
+    return {
+        'bucket_masks': bucket_masks.astype(np.uint32),
+        'bucket_starts': np.append(bucket_starts, len(word_ids)).astype(np.int32),
+        'word_ids': word_ids,
+    }
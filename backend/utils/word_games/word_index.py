@@ -0,0 +1,103 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterable, Sequence
+
+ALL_LETTERS_MASK = (1 << 26) - 1
+
+
+def letters_mask(letters: Iterable[str]) -> int:
+    """
+    Builds a 26-bit mask with bit `i` set for each letter with code `i` (a=0, ..., z=25).
+    Anything that is not a single lowercase letter is ignored.
+
+    Parameters:
+        letters (Iterable[str]): The letters to include.
+
+    Returns:
+        int: The letter mask.
+    """
+    mask = 0
+    for letter in letters:
+        if len(letter) == 1 and 'a' <= letter <= 'z':
+            mask |= 1 << (ord(letter) - 97)
+    return mask
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Counts the set bits of each value in a uint32 array."""
+    masks = masks - ((masks >> 1) & np.uint32(0x55555555))
+    masks = (masks & np.uint32(0x33333333)) + ((masks >> 2) & np.uint32(0x33333333))
+    masks = (masks + (masks >> 4)) & np.uint32(0x0F0F0F0F)
+    return ((masks * np.uint32(0x01010101)) >> 24).astype(np.uint8)
+
+
+@dataclass
+class WordIndex:
+    """
+    Per-word metadata held in NumPy arrays, so whole-dictionary scans become a few vectorized mask operations.
+    Entry `i` of every array describes `words[i]`.
+
+    Attributes:
+        words (Sequence[str]): The sorted word list.
+        letter_masks (np.ndarray): uint32, the 26-bit mask of the letters in each word.
+        lengths (np.ndarray): uint8, the length of each word.
+        first_letters (np.ndarray): uint8, the code (0-25) of the first letter of each word.
+        last_letters (np.ndarray): uint8, the code (0-25) of the last letter of each word.
+        double_letters (np.ndarray): bool, whether a letter is immediately repeated in each word (e.g. "ll" in "hello").
+        unique_letter_counts (np.ndarray): uint8, the number of distinct letters in each word.
+        letter_counts (np.ndarray): uint8, shape (number of words, 26), how many times each letter appears in each word.
+    """
+    words: Sequence[str]
+    letter_masks: np.ndarray
+    lengths: np.ndarray
+    first_letters: np.ndarray
+    last_letters: np.ndarray
+    double_letters: np.ndarray
+    unique_letter_counts: np.ndarray
+    letter_counts: np.ndarray
+
+    def subset_of(self, allowed_mask: int) -> np.ndarray:
+        """
+        Parameters:
+            allowed_mask (int): The letter mask of the allowed letters.
+
+        Returns:
+            np.ndarray: A boolean array, True for the words that use only allowed letters.
+        """
+        return (self.letter_masks & np.uint32(ALL_LETTERS_MASK & ~allowed_mask)) == 0
+
+
+def build_index_arrays(blob: bytes, offsets: Sequence[int]) -> Dict[str, np.ndarray]:
+    """
+    Computes the metadata arrays for a packed word list (see PackedWordList), vectorized over all letters at once.
+
+    Parameters:
+        blob (bytes): The concatenated lowercase words.
+        offsets (Sequence[int]): Word `i` is `blob[offsets[i]:offsets[i + 1]]`. Words must not be empty.
+
+    Returns:
+        Dict[str, np.ndarray]: The metadata arrays, keyed by WordIndex attribute name.
+    """
+    codes = np.frombuffer(blob, dtype=np.uint8) - np.uint8(ord('a'))
+    offsets = np.asarray(offsets, dtype=np.int64)
+    starts, ends = offsets[:-1], offsets[1:]
+    lengths = ends - starts
+    word_ids = np.repeat(np.arange(len(lengths)), lengths)
+
+    letter_masks = np.bitwise_or.reduceat(np.left_shift(np.uint32(1), codes.astype(np.uint32)), starts)
+    is_word_start = np.zeros(len(codes), dtype=bool)
+    is_word_start[starts] = True
+    repeated = (codes[1:] == codes[:-1]) & ~is_word_start[1:]
+    double_letters = np.zeros(len(lengths), dtype=bool)
+    double_letters[word_ids[1:][repeated]] = True
+
+    return {
+        'letter_masks': letter_masks.astype(np.uint32),
+        'lengths': lengths.astype(np.uint8),
+        'first_letters': codes[starts],
+        'last_letters': codes[ends - 1],
+        'double_letters': double_letters,
+        'unique_letter_counts': popcount(letter_masks.astype(np.uint32)),
+        'letter_counts': np.bincount(word_ids * 26 + codes, minlength=len(lengths) * 26)
+            .reshape(len(lengths), 26).astype(np.uint8),
+    }
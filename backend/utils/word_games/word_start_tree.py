@@ -1,26 +1,146 @@
-from typing import Collection
-from utils.word_games.words_tree_node import WordsTreeNode
+from array import array
+from collections import deque
+from typing import Collection, Dict, List, Tuple
+from utils.word_games.dawg import Dawg, ALPHABET_SIZE, NO_NODE, letter_code
 
 
-def build_tree(words: Collection[str]) -> WordsTreeNode:
+class _BuildNode():
     """
-    Builds a tree structure from a list of words.
+    A temporary node used while building the word graph. Discarded once the graph is flattened.
+    """
+    __slots__ = ('children', 'end_of_word')
+
+    def __init__(self):
+        self.children: Dict[int, '_BuildNode'] = {}
+        self.end_of_word = False
+
+    def signature(self) -> Tuple:
+        # children are already minimized, so identical suffixes are the same objects
+        return (self.end_of_word, tuple((code, id(child)) for code, child in self.children.items()))
+
+
+def _minimize(unchecked: List[Tuple[_BuildNode, int, _BuildNode]], down_to: int, register: Dict[Tuple, _BuildNode]) -> None:
+    """
+    Merges the most recently added nodes with equivalent registered nodes, deepest first.
+
+    Parameters:
+        unchecked (List[Tuple[_BuildNode, int, _BuildNode]]): (parent, letter code, child) edges not yet minimized.
+        down_to (int): The number of edges to leave unchecked.
+        register (Dict[Tuple, _BuildNode]): Canonical nodes keyed by their signature.
+    """
+    while len(unchecked) > down_to:
+        parent, code, child = unchecked.pop()
+        signature = child.signature()
+        existing = register.get(signature)
+        if existing is not None:
+            parent.children[code] = existing
+        else:
+            register[signature] = child
+
+
+def _flatten(root: _BuildNode) -> Dawg:
+    """
+    Numbers the nodes breadth first from the root and stores them in flat arrays.
+
+    Parameters:
+        root (_BuildNode): The root of the minimized graph.
+
+    Returns:
+        Dawg: The array-backed graph.
+    """
+    ids = {id(root): 0}
+    ordered = [root]
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        for child in node.children.values():
+            if id(child) not in ids:
+                ids[id(child)] = len(ordered)
+                ordered.append(child)
+                queue.append(child)
+
+    children = array('i', [NO_NODE]) * (len(ordered) * ALPHABET_SIZE)
+    end_of_word = bytearray(len(ordered))
+    for node_id, node in enumerate(ordered):
+        base = node_id * ALPHABET_SIZE
+        for code, child in node.children.items():
+            children[base + code] = ids[id(child)]
+        end_of_word[node_id] = node.end_of_word
+    return _summarize(children, end_of_word)
+
+
+def _summarize(children: array, end_of_word: bytearray) -> Dawg:
+    """
+    Computes the subtree summaries of every node (see Dawg) and builds the graph.
 
     Parameters:
-        words (List[str]): A list of words to be added to the tree.
+        children (array): The flattened child table.
+        end_of_word (bytearray): The end of word flag of each node.
 
     Returns:
-        WordsTreeNode: The root node of the tree.
+        Dawg: The array-backed graph. Words are assumed to be under 256 letters.
     """
-    root = WordsTreeNode('', False)
-    for word in words:
-        current_node = root
-        for letter in word:
-            if letter not in current_node.children:
-                new_node = WordsTreeNode(letter, False)
-                current_node.addOrUpdateChild(new_node)
-            current_node = current_node.children[letter]
-        current_node.setEndOfWord(True)
-    return root
+    num_nodes = len(end_of_word)
+    max_lengths = bytearray(num_nodes)
+    min_lengths = bytearray(num_nodes)
+    letter_masks = array('I', [0]) * num_nodes
+    done = bytearray(num_nodes)
+
+    def visit(node: int) -> None:
+        if done[node]:
+            return
+        longest, shortest, mask = 0, 0 if end_of_word[node] else 255, 0
+        base = node * ALPHABET_SIZE
+        for code in range(ALPHABET_SIZE):
+            child = children[base + code]
+            if child == NO_NODE:
+                continue
+            visit(child)
+            longest = max(longest, max_lengths[child] + 1)
+            shortest = min(shortest, min_lengths[child] + 1)
+            mask |= (1 << code) | letter_masks[child]
+        max_lengths[node], min_lengths[node], letter_masks[node] = longest, shortest, mask
+        done[node] = 1
+
+    for node in range(num_nodes):
+        visit(node)
+    return Dawg(children, end_of_word, max_lengths, min_lengths, letter_masks)
 
 
+def build_tree(words: Collection[str]) -> Dawg:
+    """
+    Builds a minimized word graph (DAWG) from a list of words, using incremental
+    construction over the sorted words so the full trie never exists in memory.
+    Words containing anything other than lowercase letters are skipped.
+
+    Parameters:
+        words (Collection[str]): A collection of words to be added to the graph.
+
+    Returns:
+        Dawg: The array-backed word graph.
+    """
+    register: Dict[Tuple, _BuildNode] = {}
+    unchecked: List[Tuple[_BuildNode, int, _BuildNode]] = []
+    root = _BuildNode()
+    previous_word = ''
+    for word in sorted(words):
+        codes = [letter_code(letter) for letter in word]
+        if not codes or -1 in codes:
+            continue
+        common_prefix_length = 0
+        for a, b in zip(word, previous_word):
+            if a != b:
+                break
+            common_prefix_length += 1
+        _minimize(unchecked, common_prefix_length, register)
+
+        node = unchecked[-1][2] if unchecked else root
+        for code in codes[common_prefix_length:]:
+            next_node = _BuildNode()
+            node.children[code] = next_node
+            unchecked.append((node, code, next_node))
+            node = next_node
+        node.end_of_word = True
+        previous_word = word
+    _minimize(unchecked, 0, register)
+    return _flatten(root)
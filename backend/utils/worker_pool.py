@@ -0,0 +1,175 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from utils.data_store import get_load_status, is_data_ready, load_data_store
+
+# Number of worker processes available to solvers that split their search. Each worker loads the
+# dictionary once when it starts; with an up to date snapshot (see utils.dictionary_snapshot) the
+# workers map the same file, so the pool costs little extra memory.
+WORKER_POOL_SIZE = int(os.getenv('WORKER_POOL_SIZE', str(os.cpu_count() or 1)))
+
+# spawn rather than fork, since the server process has threads running. Shared memory handed to
+# workers, e.g. with `POOL_CONTEXT.Array`, must come from the same context.
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def load_worker_data() -> None:
+    """
+    Worker initializer that loads the dictionary. Raises if the load fails, which breaks the pool,
+    rather than leaving a worker that can only answer that the dictionary is not loaded.
+    """
+    load_data_store()
+    if not is_data_ready():
+        raise RuntimeError(f"The word set failed to load in a worker: {get_load_status().error}")
+
+
+def create_process_pool(num_workers: int, initializer: Callable = load_worker_data, initargs: Tuple = ()) -> ProcessPoolExecutor:
+    """
+    Starts a pool of worker processes.
+
+    Parameters:
+        num_workers (int): The number of worker processes.
+        initializer (Callable): Run by each worker when it starts. By default it loads the dictionary.
+        initargs (Tuple): The initializer's arguments.
+
+    Returns:
+        ProcessPoolExecutor: The pool. The caller is responsible for shutting it down.
+    """
+    return ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=POOL_CONTEXT,
+        initializer=initializer,
+        initargs=initargs
+    )
+
+
+def _worker_pid(_: int) -> int:
+    return os.getpid()
+
+
+class WorkerPool:
+    """
+    A pool of WORKER_POOL_SIZE worker processes that requests never wait for: it is started, and restarted if
+    it breaks, on a background thread, and `get` returns None until its workers are up, so callers do the
+    work in process instead.
+
+    Attributes:
+        name (str): What the workers are for, for logging.
+    """
+
+    def __init__(self, name: str, initializer: Callable = load_worker_data, initargs: Tuple = ()):
+        self.name = name
+        self._initializer = initializer
+        self._initargs = initargs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._starting = False
+        self._stopped = False  # set by `shutdown`, after which the pool is never started again
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Starts the workers and waits until they are up. Does nothing if the pool is configured with fewer
+        than 2 workers, is already started or starting, or was shut down. Run it off the event loop, since
+        the workers may take a while to load their data.
+        """
+        if WORKER_POOL_SIZE < 2:
+            return
+        with self._lock:
+            if self._executor is not None or self._starting or self._stopped:
+                return
+            self._starting = True
+        logging.info(f"Starting a pool of {WORKER_POOL_SIZE} {self.name} workers.")
+        executor = create_process_pool(WORKER_POOL_SIZE, self._initializer, self._initargs)
+        try:
+            # one task per worker; a worker only takes tasks once its initializer has finished
+            list(executor.map(_worker_pid, range(WORKER_POOL_SIZE)))
+        except Exception:
+            logging.error(f"The {self.name} workers failed to start, searches will run in process.", exc_info=True)
+            executor.shutdown(wait=False)
+            executor = None
+        with self._lock:
+            self._starting = False
+            if not self._stopped:
+                self._executor, executor = executor, None
+        if executor is not None:
+            # `shutdown` ran while the workers were starting, so nothing else would ever stop them
+            executor.shutdown(wait=False)
+
+    def start_in_background(self) -> None:
+        """Starts the workers on a background thread, see `start`."""
+        threading.Thread(target=self.start, name=f"start-{self.name}-pool", daemon=True).start()
+
+    def get(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Returns:
+            ProcessPoolExecutor | None: The pool, or None if it is not running, in which case callers should
+                do the work in process.
+        """
+        return self._executor
+
+    def discard(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Replaces a pool that broke, e.g. because a worker died, with a new one started in the background.
+
+        Parameters:
+            executor (ProcessPoolExecutor): The broken pool, as returned by `get`.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return  # already replaced
+            self._executor = None
+        logging.warning(f"The {self.name} pool broke, restarting it.")
+        executor.shutdown(wait=False)
+        self.start_in_background()
+
+    def shutdown(self) -> None:
+        """Stops the workers, if they were started. Workers still starting are stopped once they are up."""
+        with self._lock:
+            self._stopped = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+# The pool for solvers that split their search over the dictionary, e.g. Word Hunt
+_worker_pool = WorkerPool("solver")
+
+
+def start_worker_pool() -> None:
+    """
+    Starts the solver workers and waits until they have loaded the dictionary. The server runs this on
+    its loading thread once the dictionary has loaded, see `WorkerPool.start`.
+    """
+    _worker_pool.start()
+
+
+def get_worker_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Gets the shared solver pool.
+
+    Returns:
+        ProcessPoolExecutor | None: The pool, or None if it is configured with fewer than 2 workers or is
+            not running yet, in which case callers should do the work in process.
+    """
+    return _worker_pool.get()
+
+
+def discard_worker_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Replaces the solver pool after it broke, see `WorkerPool.discard`.
+
+    Parameters:
+        pool (ProcessPoolExecutor): The broken pool.
+    """
+    _worker_pool.discard(pool)
+
+
+def shutdown_worker_pool() -> None:
+    """
+    Stops the worker pool, if it was started.
+    """
+    _worker_pool.shutdown()